@@ -0,0 +1,11 @@
+"""ASGI entry point. Serves the async auth views natively on an event loop."""
+import os
+from django.core.asgi import get_asgi_application
+
+from utils.cache.shared_cache import check_shared_caches
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.deployment')
+
+application= get_asgi_application()
+# Fail at startup, not per request, when a shared cache is missing or per process.
+check_shared_caches()
@@ -3,6 +3,7 @@ import sys
 import os
 from dotenv import load_dotenv
 
+from config.settings.base import *
 from config.settings.base import SECRET_KEY, INSTALLED_APPS
 from config.settings.development import ROOT_URLCONF, ALLOWED_HOSTS
 
@@ -6,7 +6,7 @@ from typing import List, Dict, Any
 from functools import lru_cache
 from dotenv import load_dotenv
 from .database import postgresql_config
-#from config.settings.cache import redis_cache_config
+from .cache import redis_cache_config
 #from config.settings.session import redis_session_config
 
 
@@ -64,6 +64,84 @@ class BaseConfig:
         """Database configurations."""
         return self._db_config
 
+    @property
+    def caches(self)-> Dict[str, Dict[str, Any]]:
+        """Cache configurations, see CacheConfig."""
+        return redis_cache_config().django_cache_config
+
+    @property
+    def templates(self)-> List[Dict[str, Any]]:
+        """Template engines. Email templates live in backend/templates."""
+        return [
+            {
+                'BACKEND':'django.template.backends.django.DjangoTemplates',
+                'DIRS':[self.base_dir / 'templates'],
+                'APP_DIRS':False,
+                'OPTIONS':{},
+            },
+        ]
+
+    @property
+    def email(self)-> Dict[str, Any]:
+        """SMTP settings used by the email outbox worker."""
+        return {
+            'EMAIL_BACKEND':os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend'),
+            'EMAIL_HOST':os.environ.get('EMAIL_HOST', 'localhost'),
+            'EMAIL_PORT':int(os.environ.get('EMAIL_PORT', 25)),
+            'EMAIL_HOST_USER':os.environ.get('EMAIL_HOST_USER', ''),
+            'EMAIL_HOST_PASSWORD':os.environ.get('EMAIL_HOST_PASSWORD', ''),
+            'EMAIL_USE_TLS':os.environ.get('EMAIL_USE_TLS', 'false').lower()=='true',
+            'EMAIL_TIMEOUT':int(os.environ.get('EMAIL_TIMEOUT', 10)),
+            'DEFAULT_FROM_EMAIL':os.environ.get('DEFAULT_FROM_EMAIL', 'no-reply@localhost'),
+        }
+
+    @property
+    def site_url(self)-> str:
+        """Public base URL used in links sent by email."""
+        return os.environ.get('SITE_URL', 'http://localhost:8000').rstrip('/')
+
+    @property
+    def auth_async_views(self)-> bool:
+        """Route register/login to the native async views (serve through config.asgi)."""
+        return os.environ.get('AUTH_ASYNC_VIEWS', 'false').lower()=='true'
+
+    @property
+    def auth_public_paths(self)-> List[str]:
+        """
+        Exact paths served without a bearer token. Override with comma-separated AUTH_PUBLIC_PATHS.
+        Matched exactly so that routes nested under a public one (register/bulk/) still need a token.
+        """
+        default=[
+            '/auth/register/',
+            '/auth/login/',
+            '/metrics/',
+        ]
+        custom= os.environ.get('AUTH_PUBLIC_PATHS')
+        if custom:
+            return [path.strip() for path in custom.split(',') if path.strip()]
+        return default
+
+    @property
+    def auth_public_prefixes(self)-> List[str]:
+        """Path prefixes served without a bearer token. Override with comma-separated AUTH_PUBLIC_PREFIXES."""
+        default=[
+            '/auth/verify/',
+            '/auth/.well-known/',
+        ]
+        custom= os.environ.get('AUTH_PUBLIC_PREFIXES')
+        if custom:
+            return [prefix.strip() for prefix in custom.split(',') if prefix.strip()]
+        return default
+
+    @property
+    def auth_operators(self)-> List[str]:
+        """
+        Emails (token subjects) allowed on operator routes such as register/bulk/, from
+        comma-separated AUTH_OPERATORS. Empty by default: no account can call them.
+        """
+        custom= os.environ.get('AUTH_OPERATORS', '')
+        return [email.strip().lower() for email in custom.split(',') if email.strip()]
+
     @property
     def middleware(self)-> List[str]:
         """List of deployed middleware. CAUTION: Order of arrangement is critical!"""
@@ -72,7 +150,10 @@ class BaseConfig:
             'django.middleware.common.CommonMiddleware',
             'django.middleware.csrf.CsrfViewMiddleware',
         ]
-        custom=[] # custom middleware here
+        custom=[
+            'utils.metrics.server_timing.ServerTimingMiddleware',
+            'utils.middleware.jwt_auth.JWTAuthenticationMiddleware',
+        ] # custom middleware here
         return default + custom
 
 
@@ -92,8 +173,24 @@ config= base_config()
 SECRET_KEY= config.secret_key
 BASE_DIR= config.base_dir
 DATABASES= config.databases
+CACHES= config.caches
 MIDDLEWARE= config.middleware
 INSTALLED_APPS= config.installed_apps
+TEMPLATES= config.templates
+SITE_URL= config.site_url
+AUTH_ASYNC_VIEWS= config.auth_async_views
+AUTH_PUBLIC_PATHS= config.auth_public_paths
+AUTH_PUBLIC_PREFIXES= config.auth_public_prefixes
+AUTH_OPERATORS= config.auth_operators
+
+EMAIL_BACKEND= config.email['EMAIL_BACKEND']
+EMAIL_HOST= config.email['EMAIL_HOST']
+EMAIL_PORT= config.email['EMAIL_PORT']
+EMAIL_HOST_USER= config.email['EMAIL_HOST_USER']
+EMAIL_HOST_PASSWORD= config.email['EMAIL_HOST_PASSWORD']
+EMAIL_USE_TLS= config.email['EMAIL_USE_TLS']
+EMAIL_TIMEOUT= config.email['EMAIL_TIMEOUT']
+DEFAULT_FROM_EMAIL= config.email['DEFAULT_FROM_EMAIL']
 
 ASGI_APPLICATION= 'config.asgi.application'
 WSGI_APPLICATION= 'config.wsgi.application'
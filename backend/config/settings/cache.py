@@ -0,0 +1,50 @@
+import os
+from functools import lru_cache
+from typing import Any, Dict
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CACHE_BACKENDS= {
+    'redis':'django.core.cache.backends.redis.RedisCache',
+    'rediss':'django.core.cache.backends.redis.RedisCache',
+    'memcached':'django.core.cache.backends.memcached.PyMemcacheCache',
+}
+
+class CacheConfig:
+    """
+    Django cache configuration from CACHE_URL, e.g. redis://cache:6379/0.
+    Without CACHE_URL the default cache is a per-process LocMemCache: fine for one worker,
+    but components that share state across workers (LOGIN_THROTTLE_BACKEND=cache,
+    CREDENTIAL_CACHE_SHARED) refuse to start on it.
+    """
+    def __init__(self):
+        self.url= os.environ.get('CACHE_URL', '')
+        self.key_prefix= os.environ.get('CACHE_KEY_PREFIX', '')
+        self.timeout= int(os.environ.get('CACHE_TIMEOUT', 300))
+
+    @property
+    def django_cache_config(self)-> Dict[str, Dict[str, Any]]:
+        """Default Django cache configurations."""
+        if not self.url:
+            return {'default':{'BACKEND':'django.core.cache.backends.locmem.LocMemCache'}}
+        parts= urlsplit(self.url)
+        backend= CACHE_BACKENDS.get(parts.scheme)
+        if backend is None:
+            raise ValueError(f'Unsupported CACHE_URL scheme "{parts.scheme}", expected one of: {", ".join(CACHE_BACKENDS)}')
+        return {
+            'default':{
+                'BACKEND':backend,
+                # Redis takes the whole URL (password and db included), memcached host:port.
+                'LOCATION':self.url if parts.scheme.startswith('redis') else parts.netloc,
+                'KEY_PREFIX':self.key_prefix,
+                'TIMEOUT':self.timeout,
+            }
+        }
+
+
+@lru_cache()
+def redis_cache_config()-> CacheConfig:
+    """Cached instance of cache configurations for faster retrieval."""
+    return CacheConfig()
@@ -1,10 +1,13 @@
 import os
 from functools import lru_cache
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 from modules.shared.base_model import BaseModel
+from utils.metrics.pool_timing import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_pool
 
 load_dotenv()
 Base= declarative_base(cls=BaseModel)
@@ -18,6 +21,25 @@ class DatabaseConfig:
         self.pg_port= os.environ.get('DB_PORT')
         self.pg_db= os.environ.get('DB_NAME')
 
+        # Connection and pool settings, shared by the SQLAlchemy engines and Django.
+        # TLS is required unless opted down: local servers without TLS set DB_SSLMODE=disable (or prefer).
+        self.sslmode= os.environ.get('DB_SSLMODE', 'require')
+        self.connect_timeout= int(os.environ.get('DB_CONNECT_TIMEOUT', 10))
+        self.pool_size= int(os.environ.get('DB_POOL_SIZE', 5))
+        self.max_overflow= int(os.environ.get('DB_MAX_OVERFLOW', 10))
+        self.pool_timeout= float(os.environ.get('DB_POOL_TIMEOUT', 30))
+        self.pool_recycle= int(os.environ.get('DB_POOL_RECYCLE', 1800))
+        self.pool_pre_ping= os.environ.get('DB_POOL_PRE_PING', 'true').lower()=='true'
+        self.conn_max_age= int(os.environ.get('DB_CONN_MAX_AGE', 600))
+
+        # Read replicas: comma-separated URLs, dropped from rotation past DB_REPLICA_MAX_LAG seconds.
+        # The monitoring role needs pg_read_all_stats to see whether a replica is still streaming.
+        # Pins (DB_REPLICA_PIN_TTL) are per process, see ReplicaRouter.
+        self.replica_urls= [url.strip() for url in os.environ.get('DB_REPLICA_URLS', '').split(',') if url.strip()]
+        self.replica_max_lag= float(os.environ.get('DB_REPLICA_MAX_LAG', 5))
+        self.replica_check_interval= float(os.environ.get('DB_REPLICA_CHECK_INTERVAL', 10))
+        self.replica_pin_ttl= float(os.environ.get('DB_REPLICA_PIN_TTL', 10))
+
         self._validate_environ()
 
     @staticmethod
@@ -41,6 +63,29 @@ class DatabaseConfig:
         return (f'postgresql://{self.pg_user}:{self.pg_pswd}@'
                 f'{self.pg_host}:{self.pg_port}/{self.pg_db}')
 
+    @property
+    def async_postgresql_url(self)-> str:
+        """PostgreSQL database URI for the asyncpg driver."""
+        return (f'postgresql+asyncpg://{self.pg_user}:{self.pg_pswd}@'
+                f'{self.pg_host}:{self.pg_port}/{self.pg_db}')
+
+    @property
+    def pool_options(self)-> Dict[str, Any]:
+        """QueuePool sizing and connection health options for create_engine."""
+        return {
+            'pool_size':self.pool_size,
+            'max_overflow':self.max_overflow,
+            'pool_timeout':self.pool_timeout,
+            'pool_recycle':self.pool_recycle,
+            'pool_pre_ping':self.pool_pre_ping,
+        }
+
+    def connect_args(self, is_async:bool=False)-> Dict[str, Any]:
+        """Driver connect arguments: psycopg2 takes libpq names, asyncpg its own."""
+        if is_async:
+            return {'ssl':self.sslmode, 'timeout':self.connect_timeout}
+        return {'sslmode':self.sslmode, 'connect_timeout':self.connect_timeout}
+
     @property
     def django_db_config(self)-> Dict[str, Dict[str, Any]]:
         """Default Django database configurations."""
@@ -52,10 +97,11 @@ class DatabaseConfig:
                 'PASSWORD':self.pg_pswd,
                 'HOST':self.pg_host,
                 'PORT':self.pg_port,
-                'CONN_MAX_AGE':600,
+                'CONN_MAX_AGE':self.conn_max_age,
+                'CONN_HEALTH_CHECKS':self.pool_pre_ping,
                 'OPTIONS':{
-                    'connect_timeout':10,
-                    'sslmode':'require',
+                    'connect_timeout':self.connect_timeout,
+                    'sslmode':self.sslmode,
                 }
             }
         }
@@ -66,24 +112,76 @@ def postgresql_config()-> DatabaseConfig:
     """Cached instance of configurations for faster retrieval."""
     return DatabaseConfig()
 
-_config= postgresql_config()
-_engine= create_engine(_config.postgresql_url)
+def create_db_engine(url:Optional[Union[str, URL]]=None, label:Optional[str]=None, **overrides)-> Engine:
+    """
+    Sync engine with the configured pool, SSL and timeout settings.
+    :param url: Database URL, the configured database if omitted.
+    :param label: Enables pool telemetry under this `engine` label.
+    :param overrides: create_engine keyword arguments taking precedence over the configured ones.
+    """
+    config= postgresql_config()
+    url= make_url(url or config.postgresql_url)
+    engine= create_engine(
+        url,
+        poolclass=TimedQueuePool,
+        # SSL and timeout arguments are libpq's: other backends (SQLite stand-ins) take none.
+        connect_args=config.connect_args() if url.get_backend_name()=='postgresql' else {},
+        **{**config.pool_options, **overrides},
+    )
+    if label:
+        instrument_pool(engine, label)
+    return engine
 
-def get_engine():
-    return _engine
+def create_async_db_engine(url:Optional[Union[str, URL]]=None, label:Optional[str]=None, **overrides)-> AsyncEngine:
+    """Same as create_db_engine for the asyncpg driver."""
+    config= postgresql_config()
+    url= make_url(url or config.async_postgresql_url)
+    engine= create_async_engine(
+        url,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        connect_args=config.connect_args(is_async=True) if url.get_backend_name()=='postgresql' else {},
+        **{**config.pool_options, **overrides},
+    )
+    if label:
+        instrument_pool(engine.sync_engine, label)
+    return engine
+
+@lru_cache()
+def get_engine()-> Engine:
+    """Sync engine, created on first use so importing settings never touches the database."""
+    return create_db_engine(label='sync')
+
+@lru_cache()
+def get_async_engine()-> AsyncEngine:
+    """Async engine, created on first use."""
+    return create_async_db_engine(label='async')
 
-def init_postgresql()-> sessionmaker:
-    """Initializes PostgreSQL with set configurations."""
-    Base.metadata.create_all(bind=_engine)
+@lru_cache()
+def get_sessionmaker()-> sessionmaker:
+    """Session factory bound to the sync engine."""
     return sessionmaker(
         autoflush=False,
         autocommit=False,
-        bind=_engine,
+        bind=get_engine(),
     )
 
+@lru_cache()
+def get_async_sessionmaker()-> async_sessionmaker:
+    """Session factory bound to the async engine."""
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+    )
 
-#--------------
-# EXPORTS
-#--------------
-
-SessionLocal= init_postgresql()
\ No newline at end of file
+def init_postgresql()-> None:
+    """
+    Creates the missing tables and indexes of every model registered on Base.
+    Run explicitly (`manage.py db_init`): importing settings never creates the schema.
+    """
+    engine= get_engine()
+    Base.metadata.create_all(bind=engine)
+    # create_all skips tables that exist: add indexes declared on them since.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
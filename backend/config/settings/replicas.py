@@ -0,0 +1,248 @@
+import logging
+import threading
+import time
+from functools import lru_cache
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
+from config.settings.database import (
+    create_async_db_engine,
+    create_db_engine,
+    get_async_engine,
+    get_engine,
+    postgresql_config,
+)
+from utils.cache.ttl_cache import TTLCache
+from utils.metrics.registry import get_metrics_registry
+
+logger= logging.getLogger('django')
+
+ASYNC_DRIVERS= {'postgresql':'postgresql+asyncpg', 'sqlite':'sqlite+aiosqlite'}
+
+# Whether the replica lost its upstream, and seconds it is behind the primary.
+# A detached replica has replayed all it received, so its lag alone would read 0 forever.
+# Without pg_read_all_stats the WAL receiver's status reads NULL: only a missing receiver counts then.
+POSTGRES_LAG_QUERY= text(
+    'SELECT'
+    ' pg_is_in_recovery() AND NOT EXISTS ('
+    "  SELECT 1 FROM pg_stat_wal_receiver WHERE COALESCE(status, 'streaming')= 'streaming'"
+    ' ) AS detached,'
+    ' CASE'
+    ' WHEN NOT pg_is_in_recovery() THEN 0'
+    ' WHEN pg_last_wal_receive_lsn()= pg_last_wal_replay_lsn() THEN 0'
+    ' ELSE COALESCE(EXTRACT(EPOCH FROM now()- pg_last_xact_replay_timestamp()), 0)'
+    ' END AS lag'
+)
+
+
+class ReplicaSession(Session):
+    """
+    Read-only session on a replica. A statement failing with a connection error is retried
+    once on the primary, and the session stays there: a replica lost between two health
+    checks costs a retry instead of a 500, and sits out until a later check passes.
+    Sessions carry their replica and the primary bind to fall back to in `info`.
+    """
+
+@event.listens_for(ReplicaSession, 'do_orm_execute')
+def fall_back_to_primary(execute_state:ORMExecuteState):
+    session= execute_state.session
+    if session.info.get('on_primary'):
+        return None
+    try:
+        return execute_state.invoke_statement()
+    except (DBAPIError, OSError) as exc:
+        # asyncpg raises a bare OSError when it cannot connect.
+        if isinstance(exc, DBAPIError) and not (exc.connection_invalidated or isinstance(exc, OperationalError)):
+            raise
+        replica:Replica= session.info['replica']
+        reason= str(getattr(exc, 'orig', None) or exc).splitlines()[0]
+        replica.mark_down(reason)
+        logger.warning(f'Read on replica {replica.name} failed, retrying on the primary: {reason}')
+        get_metrics_registry().inc('db_reads_total', target='primary', reason='replica_error')
+        # Read-only: nothing is lost by dropping the replica transaction.
+        session.rollback()
+        session.bind= session.info['primary_bind']()
+        session.info['on_primary']= True
+        return execute_state.invoke_statement()
+
+
+class Replica:
+    """One read replica: its engines, session factories and last health check."""
+
+    def __init__(self, name:str, url:str):
+        self.name= name
+        self.url= make_url(url)
+        self.engine= create_db_engine(self.url, label=name)
+        self.sessionmaker= sessionmaker(
+            class_=ReplicaSession,
+            autoflush=False,
+            autocommit=False,
+            bind=self.engine,
+            info={'replica':self, 'primary_bind':get_engine},
+        )
+        self._async_sessionmaker:Optional[async_sessionmaker]= None
+        self.healthy= False     # Until the first check passes
+        self.lag:Optional[float]= None
+        self.error:Optional[str]= None
+
+        @event.listens_for(self.engine, 'handle_error')
+        def on_error(context):
+            if context.is_disconnect:
+                self.mark_down('connection lost')
+
+    @property
+    def async_sessionmaker(self)-> async_sessionmaker:
+        """Async session factory, built on first use: most deployments only serve sync views."""
+        if self._async_sessionmaker is None:
+            backend= self.url.get_backend_name()
+            engine:AsyncEngine= create_async_db_engine(
+                self.url.set(drivername=ASYNC_DRIVERS.get(backend, self.url.drivername)),
+                label=f'{self.name}-async',
+            )
+            self._async_sessionmaker= async_sessionmaker(
+                bind=engine,
+                sync_session_class=ReplicaSession,
+                autoflush=False,
+                expire_on_commit=False,
+                info={'replica':self, 'primary_bind':lambda: get_async_engine().sync_engine},
+            )
+        return self._async_sessionmaker
+
+    def check(self, max_lag:float)-> None:
+        """Measures replication lag, marking the replica down when unreachable, detached or too far behind."""
+        detached= False
+        try:
+            with self.engine.connect() as connection:
+                if self.engine.dialect.name=='postgresql':
+                    detached, lag= connection.execute(POSTGRES_LAG_QUERY).one()
+                    self.lag= float(lag or 0)
+                else:
+                    connection.execute(text('SELECT 1'))
+                    self.lag= 0.0
+        except Exception as exc:
+            self.mark_down(str(exc).splitlines()[0] if str(exc) else type(exc).__name__)
+            return
+
+        if detached:
+            self.mark_down('not streaming from the primary')
+            return
+
+        if self.lag> max_lag:
+            self.mark_down(f'lag {self.lag:.1f}s over {max_lag:.1f}s')
+            return
+        if not self.healthy:
+            logger.info(f'Read replica {self.name} is back in rotation (lag {self.lag:.2f}s).')
+        self.healthy, self.error= True, None
+
+    def mark_down(self, reason:str)-> None:
+        if self.healthy:
+            logger.warning(f'Read replica {self.name} dropped from rotation: {reason}')
+        self.healthy, self.error= False, reason
+
+
+class ReplicaRouter:
+    """
+    Sends read-only sessions round-robin to healthy replicas, everything else to the primary.
+
+    A background thread re-checks every replica each check_interval seconds; replicas that
+    are unreachable or lag more than max_lag seconds sit out until a later check passes.
+    Keys written through a pinned session (see pin) read from the primary for pin_ttl
+    seconds, so a login right after its register sees the new row.
+
+    Pins live in this process only. A follow-up request served by another worker or host
+    can still read a replica that has not caught up; run with DB_REPLICA_PIN_TTL covering
+    DB_REPLICA_MAX_LAG and route a client's requests to one worker (sticky sessions) when
+    read-your-writes must hold across requests.
+    """
+
+    def __init__(
+            self,
+            urls:List[str],
+            max_lag:float=5.0,
+            check_interval:float=10.0,
+            pin_ttl:float=10.0,
+            pin_max_keys:int=100000,
+    ):
+        self.replicas= [Replica(f'replica{index}', url) for index, url in enumerate(urls)]
+        self.max_lag= max_lag
+        self.check_interval= check_interval
+        self._pins= TTLCache(maxsize=pin_max_keys, default_ttl=pin_ttl)
+        self._turn= count()
+        self._lock= threading.Lock()
+        self._monitor:Optional[threading.Thread]= None
+
+    def pin(self, key:str)-> None:
+        """Routes reads for key to the primary for the next pin_ttl seconds."""
+        if self.replicas:
+            self._pins.set(key, True)
+
+    def is_pinned(self, key:Optional[str])-> bool:
+        return key is not None and self._pins.get(key, False)
+
+    def choose(self, pin_key:Optional[str]=None)-> Optional[Replica]:
+        """Next healthy replica for a read, or None to read from the primary."""
+        if not self.replicas:
+            return None
+        self._start_monitor()
+        if self.is_pinned(pin_key):
+            get_metrics_registry().inc('db_reads_total', target='primary', reason='pinned')
+            return None
+        healthy= [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            get_metrics_registry().inc('db_reads_total', target='primary', reason='no_replica')
+            return None
+        replica= healthy[next(self._turn)% len(healthy)]
+        get_metrics_registry().inc('db_reads_total', target=replica.name, reason='replica')
+        return replica
+
+    def session(self, pin_key:Optional[str]=None)-> Optional[Session]:
+        replica= self.choose(pin_key)
+        return replica.sessionmaker() if replica else None
+
+    def async_session(self, pin_key:Optional[str]=None)-> Optional[AsyncSession]:
+        replica= self.choose(pin_key)
+        return replica.async_sessionmaker() if replica else None
+
+    def check_all(self)-> None:
+        for replica in self.replicas:
+            replica.check(self.max_lag)
+
+    def stats(self)-> List[Tuple[str, Dict[str, Any]]]:
+        return [
+            (replica.name, {'healthy':int(replica.healthy), 'lag_seconds':replica.lag})
+            for replica in self.replicas
+        ]
+
+    def _start_monitor(self)-> None:
+        if self._monitor is not None:
+            return
+        with self._lock:
+            if self._monitor is not None:
+                return
+            self._monitor= threading.Thread(target=self._monitor_loop, name='replica-monitor', daemon=True)
+            self._monitor.start()
+
+    def _monitor_loop(self)-> None:
+        while True:
+            try:
+                self.check_all()
+            except Exception as exc:
+                logger.warning(f'Checking read replicas failed: {str(exc)}')
+            time.sleep(self.check_interval)
+
+
+@lru_cache(maxsize=1)
+def get_replica_router()-> ReplicaRouter:
+    """Process-wide router over DB_REPLICA_URLS; routes everything to the primary when unset."""
+    config= postgresql_config()
+    return ReplicaRouter(
+        urls=config.replica_urls,
+        max_lag=config.replica_max_lag,
+        check_interval=config.replica_check_interval,
+        pin_ttl=config.replica_pin_ttl,
+    )
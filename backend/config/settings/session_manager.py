@@ -1,15 +1,181 @@
-from contextlib import contextmanager
-from config.settings.database import SessionLocal
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import List, Optional, Union
+from asgiref.sync import iscoroutinefunction
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from config.settings.database import get_async_sessionmaker, get_sessionmaker
+from config.settings.replicas import get_replica_router
+from utils.metrics.server_timing import phase
+
+
+class UnitOfWork:
+    """
+    The one primary session of a request wrapped in unit_of_work, opened on first use.
+    Sessions opened inside it flush instead of committing; the request commits once.
+    """
+
+    def __init__(self):
+        self.session:Optional[Union[Session, AsyncSession]]= None
+        self.pin_keys:List[str]= []
+        self.error:Optional[Exception]= None    # First statement failure; the transaction is lost
+
+    def should_commit(self, response)-> bool:
+        return getattr(response, 'status_code', 200)< 500
+
+    def check(self)-> None:
+        """
+        Re-raises a statement failure the view caught and answered over, e.g. with a 200:
+        its writes were rolled back, so it must not report success.
+        """
+        if self.error is not None:
+            raise self.error
+
+    def pin(self)-> None:
+        router= get_replica_router()
+        for key in self.pin_keys:
+            router.pin(key)
+
+_unit_of_work:ContextVar[Optional[UnitOfWork]]= ContextVar('unit_of_work', default=None)
+
+
+def pin_after_commit(key:str)-> None:
+    """Pins key to the primary once the current unit of work commits, or now outside of one."""
+    unit= _unit_of_work.get()
+    if unit is not None:
+        unit.pin_keys.append(key)
+    else:
+        get_replica_router().pin(key)
+
 
 @contextmanager
-def get_db_session():
-    """Provide a scoped session with automatic commit, rollback, and close."""
-    session= SessionLocal()
+def get_db_session(read_only:bool=False, pin_key:Optional[str]=None):
+    """
+    Provide a scoped session with automatic commit, rollback, and close.
+    Inside a unit_of_work view, write sessions share the request's session and are only
+    flushed here; the view's unit of work commits them once it returns.
+    :param read_only: Allows serving the session from a read replica.
+    :param pin_key: Key the session reads or writes (e.g. an email). After a write session
+        commits, read-only sessions for the same key stay on the primary for a few seconds.
+    """
+    unit= _unit_of_work.get()
+    if unit is not None and (unit.session is not None or not read_only):
+        with _unit_session(unit, pin_key, read_only) as session:
+            yield session
+        return
+
+    session= get_replica_router().session(pin_key) if read_only else None
+    if session is None:
+        session= get_sessionmaker()()
     try:
         yield session
         session.commit()
+        if pin_key is not None and not read_only:
+            get_replica_router().pin(pin_key)
     except Exception as exc:
         session.rollback()
         raise exc
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+@contextmanager
+def _unit_session(unit:UnitOfWork, pin_key:Optional[str], read_only:bool):
+    if unit.session is None:
+        unit.session= get_sessionmaker()()
+    try:
+        yield unit.session
+        unit.session.flush()
+        if pin_key is not None and not read_only:
+            unit.pin_keys.append(pin_key)
+    except Exception as exc:
+        # The transaction is unusable past a failed statement: nothing of it may commit.
+        unit.error= unit.error or exc
+        unit.session.rollback()
+        raise exc
+
+@asynccontextmanager
+async def get_async_db_session(read_only:bool=False, pin_key:Optional[str]=None):
+    """Provide an async scoped session with automatic commit, rollback, and close. See get_db_session."""
+    unit= _unit_of_work.get()
+    if unit is not None and (unit.session is not None or not read_only):
+        async with _async_unit_session(unit, pin_key, read_only) as session:
+            yield session
+        return
+
+    session= get_replica_router().async_session(pin_key) if read_only else None
+    if session is None:
+        session= get_async_sessionmaker()()
+    try:
+        yield session
+        await session.commit()
+        if pin_key is not None and not read_only:
+            get_replica_router().pin(pin_key)
+    except Exception as exc:
+        await session.rollback()
+        raise exc
+    finally:
+        await session.close()
+
+@asynccontextmanager
+async def _async_unit_session(unit:UnitOfWork, pin_key:Optional[str], read_only:bool):
+    if unit.session is None:
+        unit.session= get_async_sessionmaker()()
+    try:
+        yield unit.session
+        await unit.session.flush()
+        if pin_key is not None and not read_only:
+            unit.pin_keys.append(pin_key)
+    except Exception as exc:
+        unit.error= unit.error or exc
+        await unit.session.rollback()
+        raise exc
+
+
+def unit_of_work(view_func):
+    """
+    Runs a view in one transaction on one pooled connection, for both sync and async views.
+    Every get_db_session / get_async_db_session in the request, helpers included, reuses
+    the same session. It commits once after the view returns, and rolls back if the view
+    raises or answers with a 5xx status. A statement failure the view swallowed is re-raised,
+    so handle_exceptions answers 500 instead of reporting a write that never committed.
+    Requests that never write open no session: read-only lookups still use the replicas.
+    Work that must not join the request transaction (background syncs) opens its own session.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            unit= UnitOfWork()
+            reset_token= _unit_of_work.set(unit)
+            try:
+                response= await view_func(request, *args, **kwargs)
+                unit.check()
+                if unit.session is not None and unit.should_commit(response):
+                    with phase('commit'):
+                        await unit.session.commit()
+                    unit.pin()
+                return response
+            finally:
+                _unit_of_work.reset(reset_token)
+                if unit.session is not None:
+                    # Closing rolls back anything left uncommitted.
+                    await unit.session.close()
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        unit= UnitOfWork()
+        reset_token= _unit_of_work.set(unit)
+        try:
+            response= view_func(request, *args, **kwargs)
+            unit.check()
+            if unit.session is not None and unit.should_commit(response):
+                with phase('commit'):
+                    unit.session.commit()
+                unit.pin()
+            return response
+        finally:
+            _unit_of_work.reset(reset_token)
+            if unit.session is not None:
+                unit.session.close()
+    return wrapper
@@ -1,5 +1,7 @@
 from django.urls import path, include
+from modules.metrics.metrics_views import metrics
 
 urlpatterns=[
     path('auth/', include('modules.auth.auth_urls')),
-]
\ No newline at end of file
+    path('metrics/', metrics, name='metrics'),
+]
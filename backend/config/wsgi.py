@@ -0,0 +1,11 @@
+"""WSGI entry point for thread- or process-based servers."""
+import os
+from django.core.wsgi import get_wsgi_application
+
+from utils.cache.shared_cache import check_shared_caches
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.deployment')
+
+application= get_wsgi_application()
+# Fail at startup, not per request, when a shared cache is missing or per process.
+check_shared_caches()
@@ -0,0 +1,131 @@
+import json
+import os
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from argon2 import PasswordHasher, Type
+from django.core.management.base import BaseCommand
+from tabulate import tabulate
+
+from utils.hashing.password_hasher import argon_profile_path
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples."""
+    ordered= sorted(samples)
+    rank= max(0, min(len(ordered)-1, round(pct/100*len(ordered))-1))
+    return ordered[rank]
+
+
+class Command(BaseCommand):
+    help= 'Benchmark this host and write the strongest Argon2 profile meeting a verify latency target'
+
+    def add_arguments(self, parser):
+        cpus= os.cpu_count() or 1
+        parser.add_argument('--target-ms', type=float, default=150.0, help='Verify latency budget (default 150ms)')
+        parser.add_argument('--percentile', type=float, default=95.0, help='Latency percentile checked against the budget')
+        parser.add_argument('--concurrency', type=int, default=cpus, help='Concurrent verifications while measuring')
+        parser.add_argument('--samples', type=int, default=40, help='Verifications measured per candidate')
+        parser.add_argument('--parallelism', type=int, default=min(cpus, 4), help='Argon2 lanes per hash')
+        parser.add_argument('--min-memory-mib', type=int, default=19, help='Lowest memory cost considered')
+        parser.add_argument('--max-memory-mib', type=int, default=256, help='Highest memory cost considered')
+        parser.add_argument('--max-time-cost', type=int, default=10, help='Highest iteration count considered')
+        parser.add_argument('--output', type=str, default=None, help='Profile path (defaults to ARGON2_PROFILE_PATH)')
+        parser.add_argument('--dry-run', action='store_true', help='Report the result without writing a profile')
+
+    def handle(self, *args, **options):
+        target= options['target_ms']
+        pct= options['percentile']
+        self.stdout.write(
+            f"Calibrating Argon2 for p{pct:g} <= {target:g}ms at concurrency {options['concurrency']}..."
+        )
+
+        results= []
+        best= None
+        for memory_mib in self.memory_candidates(options['min_memory_mib'], options['max_memory_mib']):
+            for time_cost in range(1, options['max_time_cost']+1):
+                latency= self.measure(
+                    time_cost=time_cost,
+                    memory_cost=memory_mib*1024,
+                    parallelism=options['parallelism'],
+                    concurrency=options['concurrency'],
+                    samples=options['samples'],
+                    pct=pct,
+                )
+                passed= latency<= target
+                results.append([memory_mib, time_cost, f'{latency:.1f}', 'yes' if passed else 'no'])
+                if not passed:
+                    # Latency grows with time_cost, so higher iterations at this memory cost will fail too.
+                    break
+                strength= memory_mib*time_cost
+                if best is None or strength> best['strength']:
+                    best= {'strength':strength, 'memory_cost':memory_mib*1024, 'time_cost':time_cost, 'latency':latency}
+
+        self.stdout.write(tabulate(
+            results,
+            headers=['memory (MiB)', 'time_cost', f'p{pct:g} (ms)', 'within target'],
+            tablefmt='psql',
+        ))
+
+        if best is None:
+            self.stderr.write(self.style.ERROR(
+                'No candidate met the latency target. Lower --min-memory-mib or raise --target-ms.'
+            ))
+            return
+
+        profile= {
+            'time_cost':best['time_cost'],
+            'memory_cost':best['memory_cost'],
+            'parallelism':options['parallelism'],
+            'target_ms':target,
+            'percentile':pct,
+            'measured_ms':round(best['latency'], 2),
+            'concurrency':options['concurrency'],
+            'host':platform.node(),
+            'cpu_count':os.cpu_count(),
+            'calibrated_at':datetime.now(timezone.utc).isoformat(),
+        }
+        self.stdout.write(json.dumps(profile, indent=2))
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: profile not written.'))
+            return
+
+        path= Path(options['output']) if options['output'] else argon_profile_path()
+        path.write_text(json.dumps(profile, indent=2))
+        self.stdout.write(self.style.SUCCESS(f'Argon2 profile written to {path}. Restart workers to apply it.'))
+
+    @staticmethod
+    def memory_candidates(min_mib, max_mib):
+        """Memory costs from strongest to weakest, halving down to the floor."""
+        candidates= []
+        memory= max_mib
+        while memory> min_mib:
+            candidates.append(memory)
+            memory//= 2
+        candidates.append(min_mib)
+        return candidates
+
+    @staticmethod
+    def measure(time_cost, memory_cost, parallelism, concurrency, samples, pct):
+        """Verifies one hash `samples` times across `concurrency` threads and returns the latency percentile in ms."""
+        hasher= PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            type=Type.ID,
+        )
+        password= 'calibration-password'
+        hashed= hasher.hash(password)
+
+        def timed_verify(_):
+            start= time.perf_counter()
+            hasher.verify(hashed, password)
+            return (time.perf_counter()- start)*1000
+
+        # Warm up allocator and thread pool before sampling.
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(timed_verify, range(concurrency)))
+            latencies= list(pool.map(timed_verify, range(samples)))
+        return percentile(latencies, pct)
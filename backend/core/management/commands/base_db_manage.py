@@ -1,9 +1,10 @@
 import logging
 from django.core.management.base import BaseCommand
-from config.settings.database import Base, get_engine
+from config.settings.database import Base, get_engine, init_postgresql
 from config.settings.session_manager import get_db_session
-
-engine= get_engine()
+# Imported for their side effect of registering tables on Base.metadata
+import modules.auth.auth_models
+import modules.mail.mail_models
 
 class BaseDBCommand(BaseCommand):
     """Base class for database-related management commands."""
@@ -11,10 +12,16 @@ class BaseDBCommand(BaseCommand):
     def reset_database(self):
         """Drop and recreate all tables."""
         self.stdout.write('Resetting database...')
-        Base.metadata.drop_alll(bind=engine)
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.drop_all(bind=get_engine())
+        Base.metadata.create_all(bind=get_engine())
         self.stdout.write(self.style.SUCCESS('Database reset and recreated successfully!'))
 
+    def create_schema(self):
+        """Create missing tables and indexes, leaving existing ones and their data untouched."""
+        self.stdout.write('Creating missing tables and indexes...')
+        init_postgresql()
+        self.stdout.write(self.style.SUCCESS('Database schema is up to date!'))
+
     def seed_database(self):
         """Seed database with generic test data. Override in subclass if necessary."""
         self.stdout.write(self.style.WARNING('No seeding logic defined.'))
@@ -0,0 +1,80 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from tabulate import tabulate
+
+from utils.benchmarks.suite import (
+    BASELINES_PATH,
+    COMPARE_HEADERS,
+    all_cases,
+    compare,
+    environment_mismatch,
+    hashing_cases,
+    load_baselines,
+    run_cases,
+    save_baselines,
+)
+
+
+class Command(BaseCommand):
+    help= (
+        'Run the hot-path microbenchmarks (hashing, tokens, model helpers) and compare them '
+        'against the stored baselines; fails when a median regresses past the threshold.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', type=str, default=None,
+                            help='Comma-separated substrings; run only matching benchmarks')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Allowed slowdown of the median before failing, as a fraction (default 0.25)')
+        parser.add_argument('--repeat', type=int, default=None, help='Timed runs per benchmark')
+        parser.add_argument('--update-baselines', action='store_true',
+                            help=f'Store these results as the new baselines in {BASELINES_PATH.name}')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        cases= all_cases()
+        if options['only']:
+            patterns= [pattern.strip() for pattern in options['only'].split(',') if pattern.strip()]
+            cases= [case for case in cases if any(pattern in case.name for pattern in patterns)]
+            if not cases:
+                raise CommandError(f"No benchmark matches --only {options['only']}")
+
+        results= run_cases(cases, repeat=options['repeat'])
+
+        if options['update_baselines']:
+            # A full run replaces the file, dropping renamed or removed benchmarks; --only merges into it.
+            save_baselines(results, merge=bool(options['only']))
+            self.stderr.write(f'Stored {len(results)} baselines in {BASELINES_PATH}')
+
+        baselines= load_baselines()
+        mismatched= environment_mismatch(baselines)
+        if mismatched and not options['update_baselines']:
+            differing= ', '.join(mismatched)
+            self.stderr.write(self.style.WARNING(
+                f'Baselines were recorded on a different environment ({differing}); timings may not be comparable.'
+            ))
+        # Argon2 timings scale with its cost parameters: comparing across them is meaningless.
+        skipped= {case.name for case in hashing_cases()} if 'argon2' in mismatched else set()
+        comparisons= compare([result for result in results if result.name not in skipped], baselines, options['threshold'])
+        regressions= [comparison for comparison in comparisons if comparison.regressed]
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'threshold':options['threshold'],
+                'environment_mismatch':mismatched,
+                'results':[result.as_dict() for result in results],
+                'comparisons':[comparison._asdict() for comparison in comparisons],
+                'skipped':sorted(skipped),
+            }, indent=2))
+        else:
+            rows= [comparison.row() for comparison in comparisons]
+            rows+= [[name, '-', '-', '-', 'skipped (argon2 params)'] for name in sorted(skipped)]
+            self.stdout.write(tabulate(rows, headers=COMPARE_HEADERS, tablefmt='psql'))
+
+        if regressions:
+            names= ', '.join(comparison.name for comparison in regressions)
+            raise CommandError(
+                f"{len(regressions)} benchmark(s) regressed more than {options['threshold']:.0%}: {names}"
+            )
+        if not options['json']:
+            self.stdout.write(self.style.SUCCESS(f"No regressions past {options['threshold']:.0%}."))
@@ -0,0 +1,75 @@
+import json
+from django.core.management.base import BaseCommand
+from django.http import JsonResponse
+from tabulate import tabulate
+
+from modules.auth.auth_schemas import REGISTER_DECODER, RegisterResponse, json_response
+from utils.benchmarks.harness import TABLE_HEADERS, measure
+
+REGISTER_FIELDS= ['first_name', 'last_name', 'email', 'password']
+
+
+class Command(BaseCommand):
+    help= 'Benchmark register/ request decoding and response encoding: json + dict checks against msgspec schemas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=7, help='Timed runs per benchmark')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        body= json.dumps({
+            'first_name':'John',
+            'last_name':'Doe',
+            'email':'johndoe@gmail.com',
+            'password':'correct horse battery staple',
+        }).encode()
+
+        def dict_decode():
+            # Request handling as done before the schemas: json.loads, then field-by-field checks.
+            data= json.loads(body)
+            missing_fields= [field for field in REGISTER_FIELDS if not data.get(field)]
+            if missing_fields:
+                return missing_fields
+            email= data.get('email')
+            if '@' not in email or '.' not in email:
+                return email
+            if len(data.get('password'))<8:
+                return data
+            return data
+
+        def schema_decode():
+            payload= REGISTER_DECODER.decode(body)
+            payload.validate()
+            return payload
+
+        def dict_encode():
+            return JsonResponse({
+                'message':'New user registered successfully!',
+                'user_id':1,
+                'email_sent':'queued',
+            }, status=201)
+
+        def schema_encode():
+            return json_response(RegisterResponse(
+                message='New user registered successfully!',
+                user_id=1,
+                email_sent='queued',
+            ), status=201)
+
+        repeat= options['repeat']
+        results= [
+            measure('json.loads + dict checks (previous register)', dict_decode, repeat=repeat),
+            measure('REGISTER_DECODER.decode + validate', schema_decode, repeat=repeat),
+            measure('JsonResponse(dict) (previous register)', dict_encode, repeat=repeat),
+            measure('json_response(RegisterResponse)', schema_encode, repeat=repeat),
+        ]
+
+        if options['json']:
+            self.stdout.write(json.dumps([result.as_dict() for result in results], indent=2))
+            return
+
+        self.stdout.write(tabulate([result.row() for result in results], headers=TABLE_HEADERS, tablefmt='psql'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Decoding is {results[0].median/results[1].median:.1f}x faster, '
+            f'encoding {results[2].median/results[3].median:.1f}x faster with the schemas.'
+        ))
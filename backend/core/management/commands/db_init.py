@@ -0,0 +1,8 @@
+from core.management.commands.base_db_manage import BaseDBCommand
+
+
+class Command(BaseDBCommand):
+    help= 'Creates missing database tables and indexes. Run on deploy: workers and other commands no longer create them at import.'
+
+    def handle(self, *args, **options):
+        self.create_schema()
@@ -1,6 +1,6 @@
-from config.settings.database import Base
+from config.settings.database import Base, get_engine
 from config.settings.session_manager import get_db_session
-from core.management.commands.base_db_manage import BaseDBCommand, engine
+from core.management.commands.base_db_manage import BaseDBCommand
 
 
 class Command(BaseDBCommand):
@@ -16,6 +16,6 @@ class Command(BaseDBCommand):
     def reset_database(self):
         """Drop and recreate all tables."""
         self.stdout.write(self.style.WARNING('Resetting database...'))
-        Base.metadata.drop_all(bind=engine)
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.drop_all(bind=get_engine())
+        Base.metadata.create_all(bind=get_engine())
         self.stdout.write(self.style.SUCCESS('Database reset and recreated successfully!'))
\ No newline at end of file
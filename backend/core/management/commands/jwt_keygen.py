@@ -0,0 +1,47 @@
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.tokens.signing_keys import KeyRing, generate_private_key, write_private_key
+
+
+class Command(BaseCommand):
+    help= (
+        'Generate a new JWT signing key in JWT_KEYS_DIR. New keys are published in the JWKS on restart '
+        'but only sign once JWT_ACTIVE_KID names them, after consumers have refreshed their JWKS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--algorithm', choices=['EdDSA', 'RS256'], default='EdDSA', help='Signing algorithm')
+        parser.add_argument('--kid', type=str, default=None, help='Key id (defaults to a sortable UTC timestamp)')
+        parser.add_argument('--keys-dir', type=str, default=os.getenv('JWT_KEYS_DIR'), help='Key directory')
+
+    def handle(self, *args, **options):
+        if not options['keys_dir']:
+            raise CommandError('Set JWT_KEYS_DIR or pass --keys-dir.')
+
+        keys_dir= Path(options['keys_dir'])
+        keys_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        kid= options['kid'] or datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
+        path= keys_dir / f'{kid}.pem'
+        if path.exists():
+            raise CommandError(f'Key "{kid}" already exists.')
+
+        password= os.getenv('JWT_KEYS_PASSWORD')
+        write_private_key(generate_private_key(options['algorithm']), path, password.encode() if password else None)
+
+        # Loads the whole directory back, so an unreadable key fails here rather than at startup.
+        KeyRing.from_directory(keys_dir, active_kid=kid, password=password.encode() if password else None)
+        self.stdout.write(self.style.SUCCESS(f"Generated {options['algorithm']} signing key \"{kid}\" at {path}"))
+        active= os.getenv('JWT_ACTIVE_KID')
+        if active:
+            self.stdout.write(f'"{active}" keeps signing. Restart to publish "{kid}", then once consumers '
+                              f'have refreshed their JWKS set JWT_ACTIVE_KID={kid}.')
+        elif len(list(keys_dir.glob('*.pem')))> 1:
+            self.stdout.write(self.style.WARNING(
+                f'JWT_ACTIVE_KID is unset and several keys exist: set it to the key signing today before '
+                f'restarting, then to {kid} once consumers have refreshed their JWKS.'
+            ))
+        else:
+            self.stdout.write(f'"{kid}" is the only key and signs on restart.')
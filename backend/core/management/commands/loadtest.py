@@ -0,0 +1,191 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from sqlalchemy import insert, text
+from sqlalchemy.engine import make_url
+from tabulate import tabulate
+
+from config.settings.database import Base, create_db_engine, postgresql_config
+from modules.auth.auth_models import ClientUser
+from utils.benchmarks.loadtest import LOAD_TABLE_HEADERS, AuthLoadClient, OperationStats, parse_mix
+from utils.hashing.password_hasher import get_argon_config, hash_password
+# Imported for its side effect of registering its table on Base.metadata
+import modules.mail.mail_models
+
+SEED_PASSWORD= 'loadtest-password'
+
+
+def free_port()-> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help= (
+        'Load-test the auth API end to end: creates a throwaway database, seeds users, serves the app '
+        'with a real WSGI/ASGI server and drives a mix of register/login/token checks against it.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help='Seeded users available to login')
+        parser.add_argument('--mix', type=str, default='register=1,login=4,verify=15',
+                            help='Operation weights, e.g. register=1,login=4,verify=15')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client connections')
+        parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run')
+        parser.add_argument('--requests', type=int, default=None, help='Stop after this many requests')
+        parser.add_argument('--server', choices=['wsgiref', 'gunicorn', 'uvicorn'], default='wsgiref',
+                            help='wsgiref (stdlib threaded WSGI), gunicorn (WSGI) or uvicorn (ASGI)')
+        parser.add_argument('--workers', type=int, default=1, help='Server worker processes (gunicorn/uvicorn)')
+        parser.add_argument('--threads', type=int, default=8, help='Threads per gunicorn worker')
+        parser.add_argument('--async-views', action='store_true', help='Serve the native async views (uvicorn)')
+        parser.add_argument('--keep-db', action='store_true', help='Keep the throwaway database afterwards')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        mix= parse_mix(options['mix'])
+        unknown= set(mix)- set(AuthLoadClient.EXPECTED)
+        if unknown or not mix:
+            raise CommandError(f'Invalid --mix operations: {", ".join(sorted(unknown)) or "none given"}')
+
+        admin_url= make_url(postgresql_config().postgresql_url)
+        db_name= f'loadtest_{uuid.uuid4().hex[:12]}'
+        admin_engine= create_db_engine(admin_url, isolation_level='AUTOCOMMIT')
+        with admin_engine.connect() as connection:
+            connection.execute(text(f'CREATE DATABASE "{db_name}"'))
+        self.log(f'Created throwaway database {db_name}')
+
+        server= None
+        try:
+            users= self.seed(admin_url.set(database=db_name), options['users'])
+            port= free_port()
+            server, log_path= self.start_server(options, db_name, port)
+            self.wait_ready(server, port, log_path)
+
+            client= AuthLoadClient('127.0.0.1', port, users)
+            if 'verify' in mix:
+                client.prepare_tokens(min(len(users), 50))
+            self.log(f"Running {options['mix']} at concurrency {options['concurrency']}...")
+            stats, elapsed= client.run(mix, options['concurrency'], options['duration'], options['requests'])
+            self.report(stats, elapsed, options)
+        finally:
+            if server is not None:
+                server.terminate()
+                try:
+                    server.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+            if options['keep_db']:
+                self.log(f'Kept database {db_name}')
+            else:
+                with admin_engine.connect() as connection:
+                    connection.execute(text(f'DROP DATABASE IF EXISTS "{db_name}" WITH (FORCE)'))
+                self.log(f'Dropped database {db_name}')
+            admin_engine.dispose()
+
+    def log(self, message:str)-> None:
+        # Progress goes to stderr so --json output stays parseable.
+        self.stderr.write(message)
+
+    def seed(self, url, count:int):
+        """Creates the schema and inserts count users sharing one password hash."""
+        engine= create_db_engine(url)
+        try:
+            Base.metadata.create_all(bind=engine)
+            password_hash= hash_password(SEED_PASSWORD)
+            users= [(f'seed{index}@loadtest.local', SEED_PASSWORD) for index in range(count)]
+            with engine.begin() as connection:
+                if users:
+                    connection.execute(insert(ClientUser), [
+                        {'first_name':'Seed', 'last_name':'User', 'email':email, 'password_hash':password_hash}
+                        for email, _ in users
+                    ])
+        finally:
+            engine.dispose()
+        self.log(f'Seeded {count} users')
+        return users
+
+    def start_server(self, options, db_name:str, port:int):
+        """Starts the chosen server on the throwaway database, logging to a temp file."""
+        address= f'127.0.0.1:{port}'
+        commands= {
+            'wsgiref':[sys.executable, '-m', 'utils.benchmarks.wsgi_server', '127.0.0.1', str(port)],
+            'gunicorn':[sys.executable, '-m', 'gunicorn', 'config.wsgi:application', '--bind', address,
+                        '--workers', str(options['workers']), '--threads', str(options['threads'])],
+            'uvicorn':[sys.executable, '-m', 'uvicorn', 'config.asgi:application', '--host', '127.0.0.1',
+                       '--port', str(port), '--workers', str(options['workers']), '--no-access-log'],
+        }
+        env= {
+            **os.environ,
+            'DB_NAME':db_name,
+            'DJANGO_ALLOWED_HOSTS':'127.0.0.1,localhost',
+            # Every request comes from one client IP: lift login throttling so it does not cap the run.
+            'LOGIN_THROTTLE_IP_BURST':'1000000000',
+            'LOGIN_THROTTLE_IP_PER_MINUTE':'1000000000',
+            'LOGIN_THROTTLE_EMAIL_BURST':'1000000000',
+            'LOGIN_THROTTLE_EMAIL_PER_MINUTE':'1000000000',
+            'AUTH_ASYNC_VIEWS':'true' if options['async_views'] else 'false',
+        }
+        log_file= tempfile.NamedTemporaryFile(prefix='loadtest-server-', suffix='.log', delete=False)
+        self.log(f"Starting {options['server']} on {address} (log: {log_file.name})")
+        process= subprocess.Popen(
+            commands[options['server']],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+        )
+        return process, log_file.name
+
+    def wait_ready(self, server, port:int, log_path:str, timeout:float=60.0)-> None:
+        """Polls the JWKS route until the server answers."""
+        deadline= time.monotonic()+ timeout
+        while time.monotonic()< deadline:
+            if server.poll() is not None:
+                break
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/auth/.well-known/jwks.json', timeout=2):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        with open(log_path) as log:
+            tail= log.read()[-2000:]
+        raise CommandError(f'Server did not become ready:\n{tail}')
+
+    def report(self, stats, elapsed:float, options)-> None:
+        total= OperationStats('total')
+        for operation_stats in stats.values():
+            total.merge(operation_stats)
+        argon= get_argon_config()
+        config= {
+            'server':options['server'],
+            'workers':options['workers'],
+            'async_views':options['async_views'],
+            'concurrency':options['concurrency'],
+            'mix':options['mix'],
+            'elapsed_s':elapsed,
+            'argon2':{'time_cost':argon.time_cost, 'memory_cost':argon.memory_cost, 'parallelism':argon.parallelism},
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'config':config,
+                'operations':[operation_stats.as_dict(elapsed) for operation_stats in stats.values()],
+                'total':total.as_dict(elapsed),
+            }, indent=2))
+            return
+
+        rows= [operation_stats.row(elapsed) for operation_stats in stats.values()]+ [total.row(elapsed)]
+        self.stdout.write(tabulate(rows, headers=LOAD_TABLE_HEADERS, tablefmt='psql'))
+        self.stdout.write(
+            f"{options['server']} x{options['workers']}, concurrency {options['concurrency']}, {elapsed:.1f}s, "
+            f"Argon2 t={argon.time_cost} m={argon.memory_cost} p={argon.parallelism}"
+        )
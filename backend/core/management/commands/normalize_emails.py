@@ -0,0 +1,50 @@
+from django.core.management.base import CommandError
+from sqlalchemy import func, select, text, update
+
+from config.settings.session_manager import get_db_session
+from core.management.commands.base_db_manage import BaseDBCommand
+from modules.auth.auth_models import ClientUser
+
+# Case-sensitive unique constraint of the email column before uq_client_user_email_live replaced it.
+LEGACY_EMAIL_CONSTRAINT= 'client_user_email_key'
+
+
+class Command(BaseDBCommand):
+    help= (
+        'One-off step before deploying case-insensitive emails: lowercases stored emails, drops the '
+        'old case-sensitive unique constraint and creates uq_client_user_email_live. Aborts, listing '
+        'them, if live accounts differ only by email case; resolve those by hand first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report duplicates and rows to rewrite')
+
+    def handle(self, *args, **options):
+        canonical= func.lower(func.trim(ClientUser.email))
+        with get_db_session() as session:
+            duplicates= session.execute(
+                select(canonical, func.array_agg(ClientUser.id))
+                .where(ClientUser.deleted_at.is_(None))
+                .group_by(canonical)
+                .having(func.count()> 1)
+            ).all()
+            for email, user_ids in duplicates:
+                self.stdout.write(self.style.ERROR(f'{email}: live accounts {sorted(user_ids)}'))
+            if duplicates:
+                raise CommandError(f'{len(duplicates)} email(s) are shared by several live accounts, nothing was changed.')
+
+            rewrite= ClientUser.email!= canonical
+            if options['dry_run']:
+                count= session.scalar(
+                    select(func.count()).select_from(ClientUser).where(rewrite).execution_options(include_deleted=True)
+                )
+                self.stdout.write(f'{count} email(s) would be normalized.')
+                return
+
+            # Soft-deleted rows may differ only by case from a live one: the old constraint must go first.
+            session.execute(text(f'ALTER TABLE {ClientUser.__tablename__} DROP CONSTRAINT IF EXISTS {LEGACY_EMAIL_CONSTRAINT}'))
+            count= session.execute(
+                update(ClientUser).where(rewrite).values(email=canonical)
+            ).rowcount
+        self.stdout.write(self.style.SUCCESS(f'Normalized {count} email(s).'))
+        self.create_schema()
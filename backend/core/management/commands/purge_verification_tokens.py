@@ -0,0 +1,25 @@
+import time
+from django.core.management.base import BaseCommand
+
+from utils.tokens.generate_token import purge_expired_verification_tokens
+
+
+class Command(BaseCommand):
+    help= 'Delete expired email verification tokens in chunks, once or as a recurring background sweep'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows deleted per transaction')
+        parser.add_argument('--pause', type=float, default=0.05, help='Seconds to sleep between chunks')
+        parser.add_argument('--loop', action='store_true', help='Keep sweeping every --interval seconds')
+        parser.add_argument('--interval', type=float, default=300.0, help='Seconds between sweeps with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            deleted= purge_expired_verification_tokens(
+                chunk_size=options['chunk_size'],
+                pause=options['pause'],
+            )
+            self.stdout.write(self.style.SUCCESS(f'Purged {deleted} expired verification token(s).'))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,37 @@
+import time
+from django.core.management.base import BaseCommand
+
+from utils.mail.outbox import deliver_outbox_batch
+
+
+class Command(BaseCommand):
+    help= (
+        'Deliver queued outbox emails in batches over one SMTP connection per batch. '
+        'For local runs, point EMAIL_HOST/EMAIL_PORT at a stand-in server such as '
+        '`python -m aiosmtpd -n -l localhost:1025`.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Emails claimed per batch')
+        parser.add_argument('--max-attempts', type=int, default=5, help='Attempts before an email is marked failed')
+        parser.add_argument('--backoff', type=float, default=30.0, help='Base retry delay in seconds, doubled per attempt')
+        parser.add_argument('--loop', action='store_true', help='Keep polling the outbox')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to wait when the outbox is empty')
+
+    def handle(self, *args, **options):
+        while True:
+            result= deliver_outbox_batch(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+                backoff=options['backoff'],
+            )
+            if result['claimed']:
+                self.stdout.write(
+                    f"Outbox batch: {result['sent']} sent, {result['failed']} failed, "
+                    f"{result['deferred']} deferred."
+                )
+            if not options['loop']:
+                return
+            # Drain back-to-back while batches come back full.
+            if result['claimed']< options['batch_size']:
+                time.sleep(options['interval'])
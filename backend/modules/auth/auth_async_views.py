@@ -0,0 +1,135 @@
+import logging
+import msgspec
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from config.settings.session_manager import get_async_db_session, unit_of_work
+from modules.auth.auth_queries import register_user_statement
+from modules.auth.auth_schemas import (
+    REGISTER_DECODER,
+    LOGIN_DECODER,
+    RegisterResponse,
+    LoginResponse,
+    json_response,
+    error_response,
+)
+from utils.cache.credential_cache import async_load_credential, invalidate_credential
+from utils.handlers.errors.error_handlers import handle_exceptions
+from utils.hashing.hash_executor import HashingOverloadedError
+from utils.hashing.password_hasher import async_hash_password, async_verify_password, needs_rehash
+from utils.hashing.rehash_queue import get_rehash_queue
+from utils.metrics.server_timing import phase
+from utils.throttling.login_throttle import client_ip, get_login_throttle
+from utils.tokens.generate_token import generate_token
+
+logger= logging.getLogger('django')
+
+
+# Registration route (async)
+@csrf_exempt
+@handle_exceptions
+@unit_of_work
+async def async_register(request):
+    """
+    Handles user registrations on the event loop.
+    Database I/O goes through the async engine and hashing runs on the hashing pool.
+    :param request: Expected valid request method for route.
+    :return: JsonResponse confirming user registration or denying it.
+    """
+    if request.method!='POST':
+        logger.error(f'Request method invalid: expected "POST", got {request.method}')
+        return JsonResponse({
+            'error':'Invalid request method!'
+        }, status=405)
+
+    try:
+        with phase('decode'):
+            payload= REGISTER_DECODER.decode(request.body)
+            error= payload.validate()
+        if error:
+            return error_response(error, status=400)
+
+        email= payload.email
+        password= payload.password
+
+        with phase('hash'):
+            password_hash= await async_hash_password(password)
+
+        statement= register_user_statement(payload.first_name, payload.last_name, email, password_hash)
+        with phase('db'):
+            async with get_async_db_session(pin_key=email) as session:
+                user_id= (await session.execute(statement)).scalar()
+        if user_id is None:
+            return error_response('User by this email already exists!', status=409)
+        invalidate_credential(email)
+
+        logger.info(f'New user registered: {email}')
+        return json_response(RegisterResponse(
+            message='New user registered successfully!',
+            user_id=user_id,
+            email_sent='queued',
+        ), status= 201)
+
+    except (HashingOverloadedError, msgspec.DecodeError):
+        raise
+    except Exception as exc:
+        return error_response(f'An internal error occurred: {str(exc)} Please try again later.', status=500)
+
+# Login route (async)
+@csrf_exempt
+@handle_exceptions
+async def async_login(request):
+    """
+    Handles user login requests on the event loop.
+    :param request: Expected valid request method for route.
+    :returns: JSON response confirming or denying user login request.
+    """
+    if request.method!='POST':
+        logger.error(f'Invalid method: expected "POST", got {request.method} instead.')
+        return JsonResponse({
+            'error':'Invalid method!'
+        }, status=405)
+
+    with phase('decode'):
+        payload= LOGIN_DECODER.decode(request.body)
+        error= payload.validate()
+    if error:
+        return error_response(error, status=400)
+
+    email= payload.email
+    password= payload.password
+
+    # Rate limits are charged before any DB or Argon2 work, so throttled attempts cost almost nothing.
+    throttle= get_login_throttle()
+    with phase('throttle'):
+        throttle.check(client_ip(request), email)
+
+    try:
+        with phase('credential'):
+            credential= await async_load_credential(email)
+        if not credential:
+            return error_response('Invalid credentials!', status=401)
+
+        # The connection is back in the pool before the slow part: verification runs on the hashing pool.
+        with phase('hash'):
+            verified= await async_verify_password(password, credential.password_hash)
+        if not verified:
+            return error_response('Invalid credentials!', status=401)
+
+        if needs_rehash(credential.password_hash):
+            get_rehash_queue().enqueue(credential.id, credential.password_hash, password, email)
+
+        throttle.reset(email)
+        with phase('token'):
+            token= generate_token(email)
+
+        logger.info(f'User logged in successfully: {email}')
+        return json_response(LoginResponse(
+            message='Login successful!',
+            token=token,
+        ), status=200)
+
+    except HashingOverloadedError:
+        raise
+    except Exception as exc:
+        logger.error(f'An internal error occurred while logging in: {str(exc)}')
+        return error_response(f'An internal server error occurred: {str(exc)}. Please try again later.', status=500)
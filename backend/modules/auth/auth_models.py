@@ -1,5 +1,7 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import validates
 from config.settings.database import Base
+from modules.shared.emails import normalize_email
 
 
 class ClientUser(Base):
@@ -7,8 +9,18 @@ class ClientUser(Base):
 
     first_name= Column(String(40), nullable=False)
     last_name= Column(String(40), nullable=False)
-    email= Column(String(100), unique=True, nullable=False)
+    email= Column(String(100), nullable=False)   # Unique among live rows, see uq_client_user_email_live
     password_hash= Column(String(255), nullable=False)
+    email_verified_at= Column(DateTime(timezone=True), nullable=True)
+
+    @validates('email')
+    def _normalize_email(self, key, email):
+        return normalize_email(email) if email else email
+
+    @classmethod
+    def email_matches(cls, email:str):
+        """Lookup clause served by uq_client_user_email_live, whatever the case of email."""
+        return func.lower(cls.email)==normalize_email(email)
 
     def _validate_data(self):
         """Validate data before saving purposes."""
@@ -25,4 +37,43 @@ class ClientUser(Base):
             )
 
     def __repr__(self):
-        return f'<ClientUser: (id:{self.id} | name:{self.first_name} {self.last_name})>'
\ No newline at end of file
+        return f'<ClientUser: (id:{self.id} | name:{self.first_name} {self.last_name})>'
+
+# One live account per address, compared case-insensitively. Soft-deleted rows are left out,
+# so they neither reserve their email nor bloat the index that every login lookup uses.
+Index(
+    'uq_client_user_email_live',
+    func.lower(ClientUser.email),
+    unique=True,
+    postgresql_where=ClientUser.deleted_at.is_(None),
+)
+
+
+class RevokedToken(Base):
+    """
+    Revoked access tokens, kept only until the tokens they cover expire.
+    Rows with a jti revoke one token; rows without a jti revoke every token
+    issued to `sub` up to `revoked_at`.
+    """
+
+    jti= Column(String(64), unique=True, nullable=True)
+    sub= Column(String(100), index=True, nullable=False)
+    revoked_at= Column(DateTime(timezone=True), nullable=False)
+    expires_at= Column(DateTime(timezone=True), index=True, nullable=False)
+
+    def __repr__(self):
+        return f'<RevokedToken: (id:{self.id} | jti:{self.jti} | sub:{self.sub})>'
+
+
+class EmailVerificationToken(Base):
+    """
+    Pending email verification codes. Only a SHA-256 digest of each code is stored,
+    under a unique index so a verification link resolves with a single indexed lookup.
+    """
+
+    user_id= Column(Integer, ForeignKey('client_user.id', ondelete='CASCADE'), index=True, nullable=False)
+    code_hash= Column(String(64), unique=True, nullable=False)
+    expires_at= Column(DateTime(timezone=True), index=True, nullable=False)
+
+    def __repr__(self):
+        return f'<EmailVerificationToken: (id:{self.id} | user_id:{self.user_id})>'
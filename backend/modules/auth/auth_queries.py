@@ -0,0 +1,73 @@
+import secrets
+from typing import List
+from sqlalchemy import Select, cast, func, select
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.dialects.postgresql import insert
+from modules.auth.auth_models import ClientUser, EmailVerificationToken
+from modules.mail.mail_models import EmailOutbox
+from utils.tokens.generate_token import verification_email_values, verification_token_values
+
+# ON CONFLICT target inferring uq_client_user_email_live: the indexed expression and the index predicate.
+EMAIL_CONFLICT_TARGET= {
+    'index_elements':[func.lower(ClientUser.email)],
+    'index_where':ClientUser.deleted_at.is_(None),
+}
+
+
+def existing_emails_statement(emails:List[str])-> Select:
+    """Live emails among normalized emails, in their normalized form whatever case they were stored in."""
+    return select(func.lower(ClientUser.email)).where(func.lower(ClientUser.email).in_(emails)).distinct()
+
+def insert_from_user(model, new_user, values:dict):
+    """
+    INSERT ... SELECT of values for every row of the new_user CTE.
+    Constants are cast to their column types so drivers with server-side parameter
+    typing (asyncpg) do not bind them as text; SQL expressions are used as they are.
+    """
+    columns= model.__table__.c
+    selected= [
+        value if isinstance(value, ColumnElement) else cast(value, columns[name].type)
+        for name, value in values.items()
+    ]
+    return insert(model).from_select(list(values), select(*selected).select_from(new_user))
+
+def register_user_statement(
+        first_name:str,
+        last_name:str,
+        email:str,
+        password_hash:str,
+)-> Select:
+    """
+    Builds the whole registration as a single statement:
+
+        WITH new_user AS (INSERT INTO client_user ... ON CONFLICT (lower(email)) WHERE deleted_at IS NULL
+                           DO NOTHING RETURNING id),
+             new_token AS (INSERT INTO email_verification_token ... SELECT ... FROM new_user),
+             new_email AS (INSERT INTO email_outbox ... SELECT ... FROM new_user)
+        SELECT id FROM new_user
+
+    The unique live-email index decides duplicates, so there is no check-then-insert race:
+    on conflict new_user is empty, nothing else is written and the statement returns no row.
+
+    :returns: Statement whose scalar result is the new user id, or None if the email is taken.
+    """
+    verif_code= secrets.token_urlsafe(32)
+
+    new_user= (
+        insert(ClientUser)
+        .values(first_name=first_name, last_name=last_name, email=email, password_hash=password_hash)
+        .on_conflict_do_nothing(**EMAIL_CONFLICT_TARGET)
+        .returning(ClientUser.id)
+        .cte('new_user')
+    )
+    new_token= insert_from_user(EmailVerificationToken, new_user, {
+        'user_id':new_user.c.id,
+        **verification_token_values(verif_code),
+    })
+    new_email= insert_from_user(EmailOutbox, new_user, {
+        **verification_email_values(email, verif_code),
+        'status':'pending',
+        'attempts':0,
+    })
+
+    return select(new_user.c.id).add_cte(new_token.cte('new_token'), new_email.cte('new_email'))
@@ -0,0 +1,94 @@
+from typing import Optional, Union
+import msgspec
+from django.http import HttpResponse
+from modules.shared.emails import normalize_email
+
+
+def email_error(email:str):
+    """Returns the email format error message, or None if the email is valid."""
+    if '@' not in email or '.' not in email:
+        return 'Invalid email format!'
+    return None
+
+def password_error(password:str):
+    """Returns the password format error message, or None if the password is valid."""
+    if len(password)<8:
+        return 'Password must be at least 8 characters.'
+    return None
+
+
+class RequestSchema(msgspec.Struct):
+    """
+    Base for request bodies. Decoding checks JSON syntax and field types in a single pass;
+    validate() then applies the presence and format rules on the decoded fields.
+    Fields are optional at decode time so that every missing field is reported together.
+    """
+
+    def __post_init__(self):
+        # Emails are normalized at decode time, so every lookup, cache key and stored row uses one form.
+        if 'email' in self.__struct_fields__ and self.email:
+            self.email= normalize_email(self.email)
+
+    def missing_error(self)-> Optional[str]:
+        """Reports every absent or empty field, in declaration order."""
+        missing_fields= [field for field in self.__struct_fields__ if not getattr(self, field)]
+        if missing_fields:
+            return f'Missing required fields: {', '.join(missing_fields)}'
+        return None
+
+    def validate(self)-> Optional[str]:
+        """Returns the first validation error message, or None if the request is valid."""
+        return self.missing_error()
+
+
+class RegisterRequest(RequestSchema):
+    """Body of register/ and of each register/bulk/ row."""
+    first_name: Optional[str]= None
+    last_name: Optional[str]= None
+    email: Optional[str]= None
+    password: Optional[str]= None
+
+    def validate(self)-> Optional[str]:
+        return self.missing_error() or email_error(self.email) or password_error(self.password)
+
+
+class LoginRequest(RequestSchema):
+    """Body of login/."""
+    email: Optional[str]= None
+    password: Optional[str]= None
+
+
+class RegisterResponse(msgspec.Struct):
+    message: str
+    user_id: int
+    email_sent: str
+
+
+class LoginResponse(msgspec.Struct):
+    message: str
+    token: str
+
+
+class MeResponse(msgspec.Struct):
+    email: str
+    issued_at: int
+    expires_at: int
+
+
+class ErrorResponse(msgspec.Struct):
+    error: str
+
+
+REGISTER_DECODER= msgspec.json.Decoder(RegisterRequest)
+LOGIN_DECODER= msgspec.json.Decoder(LoginRequest)
+BULK_DECODER= msgspec.json.Decoder(list[msgspec.Raw])
+ENCODER= msgspec.json.Encoder()
+
+
+def json_response(payload:Union[msgspec.Struct, dict, list], status:int=200)-> HttpResponse:
+    """Encodes a response schema, or plain JSON data, with the fast codec."""
+    return HttpResponse(ENCODER.encode(payload), content_type='application/json', status=status)
+
+def error_response(message:str, status:int)-> HttpResponse:
+    """Standard `{"error": ...}` response."""
+    return json_response(ErrorResponse(error=message), status=status)
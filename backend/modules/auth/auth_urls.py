@@ -1,11 +1,33 @@
+from django.conf import settings
 from django.urls import path
-from modules.auth.auth_views import register, login
+from modules.auth.auth_views import register, register_bulk, login, logout, logout_all, me, verify_email, jwks
+
+if getattr(settings, 'AUTH_ASYNC_VIEWS', False):
+    from modules.auth.auth_async_views import async_register as register, async_login as login
 
 urlpatterns=[
     path(
         'register/', register, name='register'
     ),
+    path(
+        'register/bulk/', register_bulk, name='register_bulk'
+    ),
     path(
         'login/', login, name='login'
     ),
+    path(
+        'logout/', logout, name='logout'
+    ),
+    path(
+        'logout/all/', logout_all, name='logout_all'
+    ),
+    path(
+        'me/', me, name='me'
+    ),
+    path(
+        'verify/<str:code>/', verify_email, name='verify_email'
+    ),
+    path(
+        '.well-known/jwks.json', jwks, name='jwks'
+    ),
 ]
\ No newline at end of file
@@ -1,44 +1,49 @@
-import json
 import logging
-from django.http import JsonResponse
-from config.settings.session_manager import get_db_session
+import os
+import msgspec
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from sqlalchemy.dialects.postgresql import insert
+from config.settings.session_manager import get_db_session, pin_after_commit, unit_of_work
 from modules.auth.auth_models import ClientUser
+from modules.auth.auth_queries import EMAIL_CONFLICT_TARGET, existing_emails_statement, register_user_statement
+from modules.auth.auth_schemas import (
+    REGISTER_DECODER,
+    LOGIN_DECODER,
+    BULK_DECODER,
+    RegisterResponse,
+    LoginResponse,
+    MeResponse,
+    json_response,
+    error_response,
+)
+from utils.cache.credential_cache import invalidate_credential, load_credential
 from utils.handlers.errors.error_handlers import handle_exceptions
-from utils.hashing.password_hasher import hash_password, verify_password
-from utils.tokens.generate_token import generate_token, generate_verification_token, send_verification_email
+from utils.hashing.hash_executor import HashingOverloadedError
+from utils.hashing.password_hasher import hash_password, hash_passwords, verify_password, needs_rehash
+from utils.hashing.rehash_queue import get_rehash_queue
+from utils.metrics.server_timing import phase
+from utils.middleware.jwt_auth import is_operator
+from utils.throttling.login_throttle import client_ip, get_login_throttle
+from utils.tokens.generate_token import (
+    generate_token,
+    generate_verification_token,
+    consume_verification_token,
+    queue_verification_email,
+    revoke_token,
+    revoke_all_tokens,
+    get_token_config,
+)
 
 logger= logging.getLogger('django')
 
-def validate_request_data(data, required):
-    """
-    Validates that all required fields are present and not empty.
-    :param data: Requested data.
-    :param required: Required fields.
-    """
-    missing_fields= [field for field in required if not data.get(field)]
-    if missing_fields:
-        return False, f'Missing required fields: {', '.join(missing_fields)}'
-    return True, None
-
-def validate_email(email:str):
-    """Validates email format."""
-    if '@' not in email or '.' not in email:
-        return JsonResponse({
-            'error':'Invalid email format!',
-        }, status=400)
-    return None
-
-def validate_password(password:str):
-    """Validates password format."""
-    if len(password)<8:
-        return JsonResponse({
-            'error':'Password must be at least 8 characters.'
-        }, status=400)
-    return None
+BULK_REGISTER_MAX_ROWS= int(os.getenv('BULK_REGISTER_MAX_ROWS', 1000))
 
 
 # Registration route
+@csrf_exempt
 @handle_exceptions
+@unit_of_work
 def register(request):
     """
     Handles user registrations.
@@ -52,67 +57,151 @@ def register(request):
         }, status=405)
 
     try:
-        data= json.loads(request.body)
+        # Decoding checks JSON syntax and field types in one pass, before any DB or hashing work.
+        with phase('decode'):
+            payload= REGISTER_DECODER.decode(request.body)
+            error= payload.validate()
+        if error:
+            return error_response(error, status=400)
 
-        required=[
-            'first_name', 'last_name', 'email', 'password'
-        ]
-        is_valid, error_message= validate_request_data(data, required)
-        if not is_valid:
-            return JsonResponse({
-                'error':error_message,
-            }, status=400)
-
-        first_name= data.get('first_name')
-        last_name= data.get('last_name')
-        email= data.get('email')
-        password= data.get('password')
-
-        email_isValid= validate_email(email)
-        password_isValid= validate_password(password)
-        if email_isValid and password_isValid:
-            return email_isValid, password_isValid
-
-        # Check if user exists in database by querying email:
-        # if true, return JsonResponse denying registration request with this email.
-        with get_db_session() as session:
-            if session.query(ClientUser).filter_by(email=email).first():
-                return JsonResponse({
-                    'error':'User by this email already exists!'
-                }, status=409)
-
-        ## if not, send user an email with link to confirmation route to confirm address.
-        ## function returns boolean if link is confirmed
-        ## email should be valid for 1 hour. if confirmation doesn't happen, kill link validity.
-        ## if email link is confirmed, register new User model instance to database.
-
-        newClient= ClientUser(
-            first_name=first_name,
-            last_name=last_name,
-            email=email,
-            password_hash=hash_password(password),
-        )
-        session.add(newClient)
-        session.commit()
-
-        verif_token= generate_verification_token(email)
-        #email_sent= send_verification_email(email, verif_token)
-        email_sent= 'sent'
+        first_name= payload.first_name
+        last_name= payload.last_name
+        email= payload.email
+        password= payload.password
+
+        with phase('hash'):
+            password_hash= hash_password(password)
+
+        # One statement, one round-trip: the user, its verification token and the verification
+        # email are inserted together, and the unique email constraint reports duplicates.
+        statement= register_user_statement(first_name, last_name, email, password_hash)
+        # Pinned: the user's first login reads it from the primary, not a lagging replica.
+        with phase('db'), get_db_session(pin_key=email) as session:
+            user_id= session.execute(statement).scalar()
+        if user_id is None:
+            return error_response('User by this email already exists!', status=409)
+        invalidate_credential(email)
+        email_sent= 'queued'
 
         logger.info(f'New user registered: {email}')
-        return JsonResponse({
-            'message':'New user registered successfully!',
-            'user_id': newClient.id,
-            'email_sent': email_sent,
-        }, status= 201)
+        return json_response(RegisterResponse(
+            message='New user registered successfully!',
+            user_id=user_id,
+            email_sent=email_sent,
+        ), status= 201)
 
+    except (HashingOverloadedError, msgspec.DecodeError):
+        raise
     except Exception as exc:
         #logger.error(f'An internal error occurred during user registration: {str(exc.__annotations__)}')
+        return error_response(f'An internal error occurred: {str(exc)} Please try again later.', status=500)
+
+def decode_bulk_rows(raw_rows:list):
+    """
+    Decodes and validates every bulk row on its own, so one malformed row does not fail the rest.
+    :returns: Decoded rows (None where undecodable), per-row results (None while pending), and
+        the pending rows keyed by normalized email, first occurrence winning.
+    """
+    rows= [None]*len(raw_rows)
+    results= [None]*len(raw_rows)
+    pending= {}  # email -> row index
+    for index, raw_row in enumerate(raw_rows):
+        try:
+            row= rows[index]= REGISTER_DECODER.decode(raw_row)
+        except msgspec.ValidationError as invalid:
+            results[index]= {'index':index, 'status':400, 'error':f'Invalid request body: {str(invalid)}'}
+            continue
+        error= row.validate()
+        if error:
+            results[index]= {'index':index, 'email':row.email, 'status':400, 'error':error}
+        elif row.email in pending:
+            results[index]= {'index':index, 'email':row.email, 'status':409, 'error':'Duplicate email in request!'}
+        else:
+            pending[row.email]= index
+    return rows, results, pending
+
+# Bulk registration route
+@csrf_exempt
+@handle_exceptions
+@unit_of_work
+def register_bulk(request):
+    """
+    Registers many users from a JSON array in one pass.
+    Rows are validated with the same rules as register/, passwords are hashed in parallel,
+    duplicates are found with one query and new users are inserted with one multi-row statement.
+    Operator onboarding only: each call can queue many Argon2 hashes, inserts and emails, so the
+    bearer token must belong to an AUTH_OPERATORS account; any other account gets 403.
+    :param request: Expected valid request method for route.
+    :return: JsonResponse with a result per input row, in input order.
+    """
+    if request.method!='POST':
+        logger.error(f'Request method invalid: expected "POST", got {request.method}')
         return JsonResponse({
-            'error':f'An internal error occurred: {str(exc)} Please try again later.'
-        }, status=500)
+            'error':'Invalid request method!'
+        }, status=405)
+    if not is_operator(getattr(request, 'claims', None)):
+        return error_response('Operator access required!', status=403)
+
+    # Only the array structure is parsed here; each row is decoded and validated on its own,
+    # so one malformed row does not fail the whole request.
+    raw_rows= BULK_DECODER.decode(request.body)
+    if not raw_rows:
+        return error_response('Expected a non-empty JSON array of users.', status=400)
+    if len(raw_rows)> BULK_REGISTER_MAX_ROWS:
+        return error_response(f'At most {BULK_REGISTER_MAX_ROWS} users per request.', status=413)
+
+    rows, results, pending= decode_bulk_rows(raw_rows)
+
+    # Read-only, so no connection is held through the hashing below: the request's primary
+    # session opens at the insert. A lagging replica can only miss duplicates ON CONFLICT still catches.
+    if pending:
+        with get_db_session(read_only=True) as session:
+            existing= session.scalars(existing_emails_statement(list(pending))).all()
+        for email in existing:
+            index= pending.pop(email)
+            results[index]= {'index':index, 'email':email, 'status':409, 'error':'User by this email already exists!'}
+
+    if pending:
+        emails= list(pending)
+        hashes= hash_passwords([rows[pending[email]].password for email in emails])
+        values= [
+            {
+                'first_name':rows[pending[email]].first_name,
+                'last_name':rows[pending[email]].last_name,
+                'email':email,
+                'password_hash':password_hash,
+            }
+            for email, password_hash in zip(emails, hashes)
+        ]
+        with get_db_session() as session:
+            created= session.execute(
+                insert(ClientUser)
+                .values(values)
+                .on_conflict_do_nothing(**EMAIL_CONFLICT_TARGET)
+                .returning(ClientUser.id, ClientUser.email)
+            ).all()
+            for user_id, email in created:
+                verif_token= generate_verification_token(user_id, session=session)
+                queue_verification_email(email, verif_token, session=session)
+                index= pending.pop(email)
+                results[index]= {'index':index, 'email':email, 'status':201, 'user_id':user_id}
+                invalidate_credential(email)
+                pin_after_commit(email)
+
+        # Rows not returned lost a race with a concurrent registration.
+        for email, index in pending.items():
+            results[index]= {'index':index, 'email':email, 'status':409, 'error':'User by this email already exists!'}
+
+    created_count= sum(1 for result in results if result['status']==201)
+    logger.info(f'Bulk registration: {created_count} of {len(rows)} users registered')
+    return json_response({
+        'created':created_count,
+        'failed':len(rows)- created_count,
+        'results':results,
+    }, status=200)
 
 # Login route
+@csrf_exempt
 @handle_exceptions
 def login(request):
     """
@@ -127,45 +216,163 @@ def login(request):
             'error':'Invalid method!'
         }, status=405)
 
-    data= json.loads(request.body)
+    with phase('decode'):
+        payload= LOGIN_DECODER.decode(request.body)
+        error= payload.validate()
+    if error:
+        return error_response(error, status=400)
 
-    required= [
-        'email', 'password'
-    ]
-    is_valid, error_message= validate_request_data(data=data, required=required)
-    if not is_valid:
-        return JsonResponse({
-            'error':error_message,
-        }, status=400)
+    email= payload.email
+    password= payload.password
 
-    email= data.get('email')
-    password= data.get('password')
+    # Rate limits are charged before any DB or Argon2 work, so throttled attempts cost almost nothing.
+    throttle= get_login_throttle()
+    with phase('throttle'):
+        throttle.check(client_ip(request), email)
 
     try:
-        with get_db_session() as session:
-            user= session.query(ClientUser).filter_by(email=email).first()
-            if not user or not verify_password(password, user.password_hash):
-                return JsonResponse({
-                    'error':'Invalid credentials!'
-                }, status=401)
+        # Most logins are served from the credential cache and only pay for the hash verify.
+        with phase('credential'):
+            credential= load_credential(email)
+        if not credential:
+            return error_response('Invalid credentials!', status=401)
 
-            # generate token
-            token= generate_token(email)
+        with phase('hash'):
+            verified= verify_password(password, credential.password_hash)
+        if not verified:
+            return error_response('Invalid credentials!', status=401)
+
+        # Upgrade hashes made with outdated Argon2 parameters off the response path
+        if needs_rehash(credential.password_hash):
+            get_rehash_queue().enqueue(credential.id, credential.password_hash, password, email)
 
-            ## redirect to dashboard
+        throttle.reset(email)
 
-            # Update last login stamp
-            #user.updated_at= datetime.now()
-            session.commit()
+        # generate token
+        with phase('token'):
+            token= generate_token(email)
 
-            logger.info(f'User logged in successfully: {email}')
-            return JsonResponse({
-                'message':'Login successful!',
-                'token': token,
-            }, status=200)
+        logger.info(f'User logged in successfully: {email}')
+        return json_response(LoginResponse(
+            message='Login successful!',
+            token=token,
+        ), status=200)
 
+    except HashingOverloadedError:
+        raise
     except Exception as exc:
         logger.error(f'An internal error occurred while logging in: {str(exc)}')
+        return error_response(f'An internal server error occurred: {str(exc)}. Please try again later.', status=500)
+
+# Logout route
+@csrf_exempt
+@handle_exceptions
+@unit_of_work
+def logout(request):
+    """
+    Revokes the bearer token presented with the request.
+    :param request: Expected valid request method for route.
+    :returns: JSON response confirming logout or denying an invalid token.
+    """
+    if request.method!='POST':
+        logger.error(f'Invalid method: expected "POST", got {request.method} instead.')
         return JsonResponse({
-            'error':f'An internal server error occurred: {str(exc)}. Please try again later.'
-        }, status=500)
\ No newline at end of file
+            'error':'Invalid method!'
+        }, status=405)
+
+    if not revoke_token(request.token):
+        return JsonResponse({
+            'error':'Invalid or expired token!'
+        }, status=401)
+
+    return JsonResponse({
+        'message':'Logout successful!',
+    }, status=200)
+
+# Logout from all sessions route
+@csrf_exempt
+@handle_exceptions
+@unit_of_work
+def logout_all(request):
+    """
+    Revokes every token issued to the bearer token's user.
+    :param request: Expected valid request method for route.
+    :returns: JSON response confirming all sessions were terminated.
+    """
+    if request.method!='POST':
+        logger.error(f'Invalid method: expected "POST", got {request.method} instead.')
+        return JsonResponse({
+            'error':'Invalid method!'
+        }, status=405)
+
+    claims= request.claims
+    revoke_all_tokens(claims['sub'])
+    logger.info(f"All sessions terminated for: {claims['sub']}")
+    return JsonResponse({
+        'message':'All sessions terminated!',
+    }, status=200)
+
+# Current user route
+@handle_exceptions
+def me(request):
+    """
+    Returns the authenticated user straight from the verified token claims, without a DB query.
+    :param request: Expected valid request method for route.
+    :returns: JSON response describing the token's user.
+    """
+    if request.method!='GET':
+        logger.error(f'Invalid method: expected "GET", got {request.method} instead.')
+        return JsonResponse({
+            'error':'Invalid method!'
+        }, status=405)
+
+    claims= request.claims
+    return json_response(MeResponse(
+        email=claims['sub'],
+        issued_at=claims['iat'],
+        expires_at=claims['exp'],
+    ), status=200)
+
+
+# Email verification route
+@handle_exceptions
+@unit_of_work
+def verify_email(request, code):
+    """
+    Confirms a user's email address from the link sent at registration.
+    :param request: Expected valid request method for route.
+    :param code: Verification code embedded in the link.
+    :returns: JSON response confirming verification or rejecting the link.
+    """
+    if request.method!='GET':
+        logger.error(f'Invalid method: expected "GET", got {request.method} instead.')
+        return JsonResponse({
+            'error':'Invalid method!'
+        }, status=405)
+
+    user_id= consume_verification_token(code)
+    if user_id is None:
+        return JsonResponse({
+            'error':'Invalid or expired verification link!'
+        }, status=400)
+
+    logger.info(f'Email verified for user: {user_id}')
+    return JsonResponse({
+        'message':'Email verified successfully!',
+    }, status=200)
+
+# JWKS route
+def jwks(request):
+    """
+    Publishes the public keys tokens are signed with, so other services verify tokens locally.
+    :param request: Expected valid request method for route.
+    :returns: JWKS document, cacheable by clients and proxies.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return JsonResponse({
+            'error':'Invalid method!'
+        }, status=405)
+
+    response= HttpResponse(get_token_config().jwks_json, content_type='application/json')
+    response['Cache-Control']= f"public, max-age={os.getenv('JWKS_MAX_AGE', 300)}"
+    return response
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, DateTime, Index, Integer, JSON, String, Text, func
+from config.settings.database import Base
+
+
+class EmailOutbox(Base):
+    """
+    Outgoing emails, written in the same transaction as the change that triggers them
+    and delivered later by the send_outbox worker.
+    """
+
+    recipient= Column(String(254), nullable=False)
+    subject= Column(String(255), nullable=False)
+    template= Column(String(100), nullable=False)           # Template base name, rendered as .txt and .html
+    context= Column(JSON, nullable=False, default=dict)
+    status= Column(String(16), nullable=False, default='pending')
+    attempts= Column(Integer, nullable=False, default=0)
+    next_attempt_at= Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error= Column(Text, nullable=True)
+    sent_at= Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__= (
+        Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f'<EmailOutbox: (id:{self.id} | to:{self.recipient} | status:{self.status})>'
@@ -0,0 +1,23 @@
+from django.http import HttpResponse, JsonResponse
+from utils.metrics.collectors import register_auth_collectors
+from utils.metrics.registry import get_metrics_registry
+
+PROMETHEUS_CONTENT_TYPE= 'text/plain; version=0.0.4; charset=utf-8'
+
+register_auth_collectors(get_metrics_registry())
+
+
+# Metrics route
+def metrics(request):
+    """
+    Prometheus scrape endpoint, aggregating every worker when METRICS_DIR is set.
+    Public by default (see AUTH_PUBLIC_PATHS): restrict it at the proxy in production.
+    :param request: Expected valid request method for route.
+    :returns: Metrics in the Prometheus text exposition format.
+    """
+    if request.method!='GET':
+        return JsonResponse({
+            'error':'Invalid method!'
+        }, status=405)
+
+    return HttpResponse(get_metrics_registry().render(), content_type=PROMETHEUS_CONTENT_TYPE)
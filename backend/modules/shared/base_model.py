@@ -1,5 +1,6 @@
 import re
-from sqlalchemy.orm import declared_attr
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, declared_attr, with_loader_criteria
 from sqlalchemy import Column, DateTime, Integer, func
 
 
@@ -41,4 +42,21 @@ class BaseModel:
             raise exc
 
     def __repr__(self):
-        return f'<{self.__class__.__name__}(id={self.id})>'
\ No newline at end of file
+        return f'<{self.__class__.__name__}(id={self.id})>'
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def hide_soft_deleted(execute_state:ORMExecuteState)-> None:
+    """
+    Adds `deleted_at IS NULL` for every model in ORM SELECTs of every session, sync or async.
+    Opt out per statement with `.execution_options(include_deleted=True)`.
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get('include_deleted', False)
+    ):
+        execute_state.statement= execute_state.statement.options(
+            with_loader_criteria(BaseModel, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
@@ -0,0 +1,3 @@
+def normalize_email(email:str)-> str:
+    """Canonical form of an email address, used wherever emails are compared."""
+    return email.strip().lower()
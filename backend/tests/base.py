@@ -0,0 +1,58 @@
+import unittest
+import uuid
+from typing import List
+from django.test import SimpleTestCase
+from sqlalchemy import delete, func, update
+
+from config.settings.database import get_engine, init_postgresql
+from config.settings.session_manager import get_db_session
+from modules.auth.auth_models import ClientUser
+from modules.mail.mail_models import EmailOutbox
+
+
+class DatabaseTestCase(SimpleTestCase):
+    """
+    Runs against the Postgres configured by the DB_* variables, skipping when it is unreachable.
+    Every test writes users under fresh emails from new_email(), deleted again afterwards.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        try:
+            with get_engine().connect():
+                pass
+        except Exception as exc:
+            raise unittest.SkipTest(f'Postgres is unreachable: {str(exc).splitlines()[0]}')
+        init_postgresql()
+
+    def setUp(self):
+        self.emails:List[str]= []
+
+    def tearDown(self):
+        if not self.emails:
+            return
+        with get_db_session() as session:
+            session.execute(delete(EmailOutbox).where(EmailOutbox.recipient.in_(self.emails)))
+            # Verification tokens go with their user (ON DELETE CASCADE).
+            session.execute(delete(ClientUser).where(func.lower(ClientUser.email).in_(self.emails)))
+
+    def new_email(self)-> str:
+        email= f'test-{uuid.uuid4().hex}@example.com'
+        self.emails.append(email)
+        return email
+
+    def add_user(self, email:str, session=None)-> ClientUser:
+        user= ClientUser(first_name='Test', last_name='User', email=email, password_hash='not-a-hash')
+        if session is not None:
+            session.add(user)
+            session.flush()
+            return user
+        with get_db_session() as session:
+            session.add(user)
+            session.flush()
+        return user
+
+    def soft_delete_user(self, email:str)-> None:
+        with get_db_session() as session:
+            session.execute(update(ClientUser).where(ClientUser.email==email).values(deleted_at=func.now()))
@@ -0,0 +1,102 @@
+import json
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from sqlalchemy import select
+
+from config.settings.session_manager import get_db_session
+from modules.auth.auth_models import ClientUser
+from modules.auth.auth_queries import existing_emails_statement
+from modules.auth.auth_views import decode_bulk_rows, register, register_bulk
+from modules.shared.emails import normalize_email
+from tests.base import DatabaseTestCase
+
+
+class SoftDeleteTests(DatabaseTestCase):
+
+    def test_soft_deleted_rows_are_hidden(self):
+        email= self.new_email()
+        self.add_user(email)
+        self.soft_delete_user(email)
+        with get_db_session() as session:
+            self.assertIsNone(session.scalar(select(ClientUser).where(ClientUser.email==email)))
+            self.assertIsNone(session.scalar(select(ClientUser.id).where(ClientUser.email==email)))
+
+    def test_include_deleted_returns_soft_deleted_rows(self):
+        email= self.new_email()
+        self.add_user(email)
+        self.soft_delete_user(email)
+        with get_db_session() as session:
+            user= session.scalar(
+                select(ClientUser).where(ClientUser.email==email).execution_options(include_deleted=True)
+            )
+            self.assertIsNotNone(user)
+            self.assertIsNotNone(user.deleted_at)
+
+
+class RegisterTests(DatabaseTestCase):
+
+    def register(self, email:str):
+        request= RequestFactory().post(
+            '/auth/register/',
+            data=json.dumps({'first_name':'Test', 'last_name':'User', 'email':email, 'password':'correct-horse'}),
+            content_type='application/json',
+        )
+        return register(request)
+
+    def test_duplicate_email_in_another_case_is_rejected(self):
+        email= self.new_email()
+        self.assertEqual(self.register(email).status_code, 201)
+        response= self.register(email.upper())
+        self.assertEqual(response.status_code, 409)
+        with get_db_session() as session:
+            users= session.scalars(select(ClientUser).where(ClientUser.email_matches(email))).all()
+        self.assertEqual(len(users), 1)
+
+    def test_email_of_a_soft_deleted_user_can_register_again(self):
+        # ON CONFLICT only infers the partial live-email index: deleted rows must not conflict.
+        email= self.new_email()
+        self.add_user(email)
+        self.soft_delete_user(email)
+        self.assertEqual(self.register(email).status_code, 201)
+
+
+class EmailNormalizationTests(SimpleTestCase):
+
+    def test_normalize_email(self):
+        self.assertEqual(normalize_email('  John.Doe@Example.COM '), 'john.doe@example.com')
+
+    def test_model_and_lookup_use_the_normalized_email(self):
+        self.assertEqual(ClientUser(email='John@Example.com').email, 'john@example.com')
+        clause= ClientUser.email_matches(' JOHN@example.com').compile(compile_kwargs={'literal_binds':True})
+        self.assertEqual(str(clause), "lower(client_user.email) = 'john@example.com'")
+
+    def test_bulk_rows_are_keyed_by_normalized_email(self):
+        row= {'first_name':'Test', 'last_name':'User', 'password':'correct-horse'}
+        raw_rows= [
+            json.dumps({**row, 'email':'John@Example.com'}).encode(),
+            json.dumps({**row, 'email':'john@example.COM'}).encode(),
+            json.dumps({**row, 'email':'jane@example.com'}).encode(),
+        ]
+        _, results, pending= decode_bulk_rows(raw_rows)
+        self.assertEqual(pending, {'john@example.com':0, 'jane@example.com':2})
+        self.assertEqual(results[1]['status'], 409)
+
+    def test_existing_emails_are_selected_normalized(self):
+        # The duplicate check pops pending by the selected value: it must be lower(email), not the stored case.
+        statement= str(existing_emails_statement(['john@example.com']))
+        self.assertTrue(statement.startswith('SELECT DISTINCT lower(client_user.email)'), statement)
+
+
+@override_settings(AUTH_OPERATORS=['ops@example.com'])
+class BulkRegisterAccessTests(SimpleTestCase):
+
+    def post_bulk(self, sub:str):
+        request= RequestFactory().post('/auth/register/bulk/', data='[]', content_type='application/json')
+        request.claims= {'sub':sub}
+        return register_bulk(request)
+
+    def test_normal_user_is_forbidden(self):
+        self.assertEqual(self.post_bulk('someone@example.com').status_code, 403)
+
+    def test_operator_passes_the_gate(self):
+        # An empty array is rejected only after the operator check.
+        self.assertEqual(self.post_bulk('Ops@Example.com').status_code, 400)
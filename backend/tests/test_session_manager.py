@@ -0,0 +1,51 @@
+from django.http import HttpResponse
+from django.test import RequestFactory
+from sqlalchemy import select, text
+
+from config.settings.session_manager import get_db_session, unit_of_work
+from modules.auth.auth_models import ClientUser
+from tests.base import DatabaseTestCase
+
+
+class UnitOfWorkTests(DatabaseTestCase):
+
+    def stored(self, email:str)-> bool:
+        with get_db_session() as session:
+            return session.scalar(select(ClientUser.id).where(ClientUser.email==email)) is not None
+
+    def run_view(self, email:str, status:int):
+        @unit_of_work
+        def view(request):
+            self.add_user(email)
+            # A second helper session joins the same transaction.
+            with get_db_session() as session:
+                session.execute(text('SELECT 1'))
+            return HttpResponse(status=status)
+        return view(RequestFactory().post('/'))
+
+    def test_commits_on_success(self):
+        email= self.new_email()
+        self.assertEqual(self.run_view(email, 201).status_code, 201)
+        self.assertTrue(self.stored(email))
+
+    def test_rolls_back_on_server_error_response(self):
+        email= self.new_email()
+        self.assertEqual(self.run_view(email, 500).status_code, 500)
+        self.assertFalse(self.stored(email))
+
+    def test_rolls_back_and_raises_when_a_failure_is_swallowed(self):
+        email= self.new_email()
+
+        @unit_of_work
+        def view(request):
+            self.add_user(email)
+            try:
+                with get_db_session() as session:
+                    session.execute(text('SELECT * FROM missing_table'))
+            except Exception:
+                pass
+            return HttpResponse(status=200)
+
+        with self.assertRaises(Exception):
+            view(RequestFactory().post('/'))
+        self.assertFalse(self.stored(email))
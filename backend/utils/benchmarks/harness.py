@@ -0,0 +1,86 @@
+import statistics
+import time
+import timeit
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class BenchResult:
+    """Per-call timings of one benchmarked function, one sample per run."""
+    name: str
+    loops: int
+    samples: List[float]= field(default_factory=list)  # Seconds per call, one entry per run
+
+    @property
+    def mean(self)-> float:
+        return statistics.fmean(self.samples)
+
+    @property
+    def median(self)-> float:
+        return statistics.median(self.samples)
+
+    @property
+    def stdev(self)-> float:
+        return statistics.stdev(self.samples) if len(self.samples)> 1 else 0.0
+
+    @property
+    def best(self)-> float:
+        return min(self.samples)
+
+    @property
+    def ops_per_sec(self)-> float:
+        return 1/self.median if self.median else float('inf')
+
+    def as_dict(self)-> Dict[str, Any]:
+        """Summary in microseconds per call, suitable for JSON output."""
+        return {
+            'name':self.name,
+            'loops':self.loops,
+            'runs':len(self.samples),
+            'mean_us':self.mean*1e6,
+            'median_us':self.median*1e6,
+            'stdev_us':self.stdev*1e6,
+            'best_us':self.best*1e6,
+            'ops_per_sec':self.ops_per_sec,
+        }
+
+    def row(self)-> List[Any]:
+        """Table row for tabulate output."""
+        return [
+            self.name,
+            f'{self.median*1e6:,.2f}',
+            f'{self.stdev*1e6:,.2f}',
+            f'{self.best*1e6:,.2f}',
+            f'{self.ops_per_sec:,.0f}',
+        ]
+
+
+TABLE_HEADERS= ['benchmark', 'median (us)', 'stdev (us)', 'best (us)', 'ops/s']
+
+
+def measure(
+        name:str,
+        func:Callable[[], Any],
+        loops:Optional[int]=None,
+        repeat:int=7,
+        warmup:int=1,
+)-> BenchResult:
+    """
+    Times func over `repeat` runs of `loops` calls each, after warming it up.
+
+    :param name: Label reported with the result.
+    :param func: Zero-argument callable to benchmark.
+    :param loops: Calls per run. If omitted, picked so a run takes at least 0.2s.
+    :param repeat: Number of timed runs.
+    :param warmup: Untimed runs before measuring, to fill caches and settle allocators.
+    :returns: BenchResult with per-call seconds for every run.
+    """
+    timer= timeit.Timer(func, timer=time.perf_counter)
+    if loops is None:
+        loops, _= timer.autorange()
+    for _ in range(warmup):
+        timer.timeit(loops)
+    # Timer.timeit disables the garbage collector while timing.
+    samples= [timer.timeit(loops)/loops for _ in range(repeat)]
+    return BenchResult(name=name, loops=loops, samples=samples)
@@ -0,0 +1,205 @@
+import http.client
+import json
+import random
+import statistics
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+LOAD_TABLE_HEADERS= ['Operation', 'Requests', 'Errors', 'Error %', 'Req/s', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)']
+
+
+@dataclass
+class OperationStats:
+    """Latencies and outcomes of one operation type over a load-test run."""
+    name: str
+    latencies: List[float]= field(default_factory=list)     # Seconds, successful and failed requests
+    errors: int= 0
+    statuses: Dict[str, int]= field(default_factory=dict)
+
+    def record(self, latency:float, status:str, ok:bool)-> None:
+        self.latencies.append(latency)
+        self.statuses[status]= self.statuses.get(status, 0)+ 1
+        if not ok:
+            self.errors+= 1
+
+    def merge(self, other:'OperationStats')-> None:
+        self.latencies.extend(other.latencies)
+        self.errors+= other.errors
+        for status, count in other.statuses.items():
+            self.statuses[status]= self.statuses.get(status, 0)+ count
+
+    @property
+    def requests(self)-> int:
+        return len(self.latencies)
+
+    def percentile(self, percent:int)-> float:
+        """Exact percentile latency in seconds."""
+        if len(self.latencies)< 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100, method='inclusive')[percent- 1]
+
+    def as_dict(self, elapsed:float)-> Dict[str, Any]:
+        """Summary with latencies in milliseconds, suitable for JSON output."""
+        return {
+            'operation':self.name,
+            'requests':self.requests,
+            'errors':self.errors,
+            'error_rate':self.errors/self.requests if self.requests else 0.0,
+            'req_per_sec':self.requests/elapsed if elapsed else 0.0,
+            'p50_ms':self.percentile(50)*1000,
+            'p95_ms':self.percentile(95)*1000,
+            'p99_ms':self.percentile(99)*1000,
+            'statuses':dict(sorted(self.statuses.items())),
+        }
+
+    def row(self, elapsed:float)-> List[Any]:
+        """Table row for LOAD_TABLE_HEADERS."""
+        summary= self.as_dict(elapsed)
+        return [
+            self.name,
+            summary['requests'],
+            summary['errors'],
+            f"{summary['error_rate']*100:.2f}",
+            f"{summary['req_per_sec']:,.1f}",
+            f"{summary['p50_ms']:.2f}",
+            f"{summary['p95_ms']:.2f}",
+            f"{summary['p99_ms']:.2f}",
+        ]
+
+
+def parse_mix(mix:str)-> Dict[str, float]:
+    """Parses `register=1,login=4,verify=5` into operation weights."""
+    weights= {}
+    for part in mix.split(','):
+        name, _, weight= part.partition('=')
+        weights[name.strip()]= float(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight> 0}
+
+
+class AuthLoadClient:
+    """
+    Drives auth endpoints over persistent HTTP/1.1 connections, one per worker thread.
+
+    Operations:
+        register  POST auth/register/ with a fresh email (expects 201)
+        login     POST auth/login/ as a random seeded user (expects 200)
+        verify    GET auth/me/ with a token from a seeded login (expects 200)
+    """
+    EXPECTED= {'register':201, 'login':200, 'verify':200}
+
+    def __init__(self, host:str, port:int, users:List[Tuple[str, str]], timeout:float=30.0):
+        self.host= host
+        self.port= port
+        self.users= users
+        self.timeout= timeout
+        self.tokens:List[str]= []
+
+    def connect(self)-> http.client.HTTPConnection:
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def request(
+            self,
+            connection:http.client.HTTPConnection,
+            method:str,
+            path:str,
+            body:Optional[Dict[str, Any]]=None,
+            token:Optional[str]=None,
+    )-> Tuple[int, bytes]:
+        headers= {'Content-Type':'application/json'}
+        if token:
+            headers['Authorization']= f'Bearer {token}'
+        connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        response= connection.getresponse()
+        return response.status, response.read()
+
+    def login(self, connection, email:str, password:str)-> Tuple[int, bytes]:
+        return self.request(connection, 'POST', '/auth/login/', {'email':email, 'password':password})
+
+    def prepare_tokens(self, count:int)-> None:
+        """Logs in a few seeded users up front so `verify` measures token checks only."""
+        connection= self.connect()
+        try:
+            for email, password in self.users[:count]:
+                status, body= self.login(connection, email, password)
+                if status!=200:
+                    raise RuntimeError(f'Seed login failed with {status}: {body[:200]!r}')
+                self.tokens.append(json.loads(body)['token'])
+        finally:
+            connection.close()
+
+    def operation(self, name:str, connection)-> Tuple[int, bytes]:
+        if name=='register':
+            return self.request(connection, 'POST', '/auth/register/', {
+                'first_name':'Load',
+                'last_name':'Test',
+                'email':f'{uuid.uuid4().hex}@loadtest.local',
+                'password':'loadtest-password',
+            })
+        if name=='login':
+            return self.login(connection, *random.choice(self.users))
+        if name=='verify':
+            return self.request(connection, 'GET', '/auth/me/', token=random.choice(self.tokens))
+        raise ValueError(f'Unknown operation: {name}')
+
+    def run(
+            self,
+            mix:Dict[str, float],
+            concurrency:int,
+            duration:float,
+            max_requests:Optional[int]=None,
+    )-> Tuple[Dict[str, OperationStats], float]:
+        """
+        Runs concurrency workers until duration elapses or max_requests are sent.
+        :returns: Per-operation stats and the elapsed wall time in seconds.
+        """
+        names= list(mix)
+        weights= [mix[name] for name in names]
+        deadline= time.monotonic()+ duration
+        budget= [max_requests] if max_requests else None
+        budget_lock= threading.Lock()
+        results:List[Dict[str, OperationStats]]= []
+
+        def take_budget()-> bool:
+            if budget is None:
+                return True
+            with budget_lock:
+                if budget[0]<= 0:
+                    return False
+                budget[0]-= 1
+                return True
+
+        def worker()-> None:
+            stats= {name: OperationStats(name) for name in names}
+            connection= self.connect()
+            try:
+                while time.monotonic()< deadline and take_budget():
+                    name= random.choices(names, weights)[0]
+                    started= time.perf_counter()
+                    try:
+                        status, _= self.operation(name, connection)
+                        label, ok= str(status), status==self.EXPECTED[name]
+                    except (OSError, http.client.HTTPException) as exc:
+                        label, ok= type(exc).__name__, False
+                        connection.close()
+                        connection= self.connect()
+                    stats[name].record(time.perf_counter()- started, label, ok)
+            finally:
+                connection.close()
+                results.append(stats)
+
+        threads= [threading.Thread(target=worker, name=f'loadtest-{index}') for index in range(concurrency)]
+        started= time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed= time.perf_counter()- started
+
+        totals= {name: OperationStats(name) for name in names}
+        for stats in results:
+            for name, operation_stats in stats.items():
+                totals[name].merge(operation_stats)
+        return totals, elapsed
@@ -0,0 +1,168 @@
+import json
+import os
+import platform
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from utils.benchmarks.harness import BenchResult, measure
+
+BASELINES_PATH= Path(__file__).resolve().parent / 'baselines.json'
+COMPARE_HEADERS= ['benchmark', 'baseline (us)', 'current (us)', 'change', 'status']
+
+
+class BenchCase(NamedTuple):
+    """One hot function to benchmark. setup() runs once, untimed, and returns the timed callable."""
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    loops: Optional[int]= None      # None: auto-ranged to ~0.2s per run
+    repeat: int= 7
+
+
+def hashing_cases()-> List[BenchCase]:
+    """Argon2 entry points. Loops are fixed at 1: each call already takes tens of milliseconds."""
+    from utils.hashing.password_hasher import hash_password, needs_rehash, verify_password
+
+    password= 'correct horse battery staple'
+
+    def verify_setup():
+        hashed= hash_password(password)
+        return lambda: verify_password(password, hashed)
+
+    def needs_rehash_setup():
+        hashed= hash_password(password)
+        return lambda: needs_rehash(hashed)
+
+    return [
+        BenchCase('hash_password', lambda: lambda: hash_password(password), loops=1, repeat=5),
+        BenchCase('verify_password', verify_setup, loops=1, repeat=5),
+        BenchCase('needs_rehash', needs_rehash_setup),
+    ]
+
+def token_cases()-> List[BenchCase]:
+    """
+    Token issuance, verification and claims validation. The revocation check is measured on
+    its own, in-memory filter: verify_token would also time its database confirmations.
+    """
+    from utils.cache.bloom_filter import ExpiringBloomFilter
+    from utils.tokens.claims import PayloadInterface
+    from utils.tokens.generate_token import generate_token, get_token_config, verified_claims
+
+    subject= 'johndoe@gmail.com'
+
+    def verify_setup():
+        token= generate_token(subject)
+        verified_claims(token)
+        return lambda: verified_claims(token)
+
+    def decode_setup():
+        token= generate_token(subject)
+        config= get_token_config()
+        return lambda: config.de_tokenize(token)
+
+    def validate_setup():
+        now= int(time.time())
+        claims= {'sub':subject, 'exp':now+ 900, 'iat':now, 'jti':'0'*32}
+        return lambda: PayloadInterface.validate(claims)
+
+    def revocation_filter_setup():
+        exp= int(time.time())+ 900
+        revoked= ExpiringBloomFilter(100000, 0.001, bucket_seconds=300)
+        for index in range(1000):
+            revoked.add(f'jti:{index:032x}', exp)
+        missing= 'jti:'+ 'f'*32
+        return lambda: revoked.might_contain(missing, exp)
+
+    return [
+        BenchCase('generate_token', lambda: lambda: generate_token(subject)),
+        BenchCase('verified_claims (cached claims)', verify_setup),
+        BenchCase('de_tokenize (uncached verify)', decode_setup),
+        BenchCase('PayloadInterface.validate', validate_setup),
+        BenchCase('revocation filter miss', revocation_filter_setup),
+    ]
+
+def model_cases()-> List[BenchCase]:
+    """Model helpers called on every mapped class."""
+    from modules.shared.base_model import camel_to_snake
+
+    return [
+        BenchCase('camel_to_snake', lambda: lambda: camel_to_snake('EmailVerificationToken')),
+    ]
+
+def all_cases()-> List[BenchCase]:
+    return hashing_cases()+ token_cases()+ model_cases()
+
+
+def run_cases(cases:List[BenchCase], repeat:Optional[int]=None)-> List[BenchResult]:
+    """Runs every case with warmup and repeated runs."""
+    return [
+        measure(case.name, case.setup(), loops=case.loops, repeat=repeat or case.repeat)
+        for case in cases
+    ]
+
+
+def environment()-> Dict[str, Any]:
+    """What a baseline was measured on. Numbers only compare on a matching environment."""
+    from utils.hashing.password_hasher import get_argon_config
+
+    argon= get_argon_config()
+    return {
+        'python':platform.python_version(),
+        'implementation':platform.python_implementation(),
+        'machine':platform.machine(),
+        'system':platform.system(),
+        'cpu_count':os.cpu_count(),
+        'argon2':{'time_cost':argon.time_cost, 'memory_cost':argon.memory_cost, 'parallelism':argon.parallelism},
+    }
+
+def load_baselines(path:Path=BASELINES_PATH)-> Dict[str, Any]:
+    if not path.exists():
+        return {'environment':{}, 'benchmarks':{}}
+    return json.loads(path.read_text())
+
+def save_baselines(results:List[BenchResult], path:Path=BASELINES_PATH, merge:bool=True)-> None:
+    """Writes results as the new baselines, keeping other benchmarks' entries when merging."""
+    baselines= load_baselines(path) if merge else {'benchmarks':{}}
+    baselines['environment']= environment()
+    for result in results:
+        baselines['benchmarks'][result.name]= result.as_dict()
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True)+ '\n')
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline_us: Optional[float]
+    current_us: float
+    change: Optional[float]     # Relative change of the median, +0.10 = 10% slower
+    regressed: bool
+
+    def row(self)-> List[Any]:
+        if self.baseline_us is None:
+            return [self.name, '-', f'{self.current_us:,.2f}', '-', 'new']
+        return [
+            self.name,
+            f'{self.baseline_us:,.2f}',
+            f'{self.current_us:,.2f}',
+            f'{self.change:+.1%}',
+            'REGRESSED' if self.regressed else 'ok',
+        ]
+
+
+def compare(results:List[BenchResult], baselines:Dict[str, Any], threshold:float)-> List[Comparison]:
+    """Flags every result whose median is more than threshold slower than its baseline median."""
+    comparisons= []
+    for result in results:
+        current= result.median*1e6
+        baseline= baselines.get('benchmarks', {}).get(result.name)
+        if baseline is None:
+            comparisons.append(Comparison(result.name, None, current, None, False))
+            continue
+        change= current/baseline['median_us']- 1
+        comparisons.append(Comparison(result.name, baseline['median_us'], current, change, change> threshold))
+    return comparisons
+
+def environment_mismatch(baselines:Dict[str, Any])-> List[str]:
+    """Environment keys that differ from the baseline's, making comparisons unreliable."""
+    recorded= baselines.get('environment', {})
+    current= environment()
+    return [key for key in current if key in recorded and recorded[key]!= current[key]]
@@ -0,0 +1,35 @@
+"""
+Minimal threaded WSGI server from the standard library, used by the loadtest command
+when no production server is installed:
+
+    python -m utils.benchmarks.wsgi_server 127.0.0.1 8000
+"""
+import os
+import sys
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    """One thread per connection, like Django's runserver, without its dev-only checks."""
+    daemon_threads= True
+    request_queue_size= 128
+
+
+class QuietHandler(WSGIRequestHandler):
+    """Skips per-request access logging, which would dominate the timings."""
+    def log_message(self, format, *args):
+        pass
+
+
+def main()-> None:
+    host, port= sys.argv[1], int(sys.argv[2])
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.deployment')
+    from config.wsgi import application
+
+    with make_server(host, port, application, server_class=ThreadingWSGIServer, handler_class=QuietHandler) as server:
+        server.serve_forever()
+
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,74 @@
+import hashlib
+import math
+import threading
+import time
+from typing import Dict, Iterator
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys using double hashing of one BLAKE2b digest."""
+    def __init__(self, capacity:int, error_rate:float):
+        self.size= max(8, math.ceil(-capacity*math.log(error_rate)/(math.log(2)**2)))
+        self.hash_count= max(1, round(self.size/capacity*math.log(2)))
+        self._bits= bytearray((self.size+7)//8)
+
+    def _positions(self, key:str)-> Iterator[int]:
+        digest= hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first= int.from_bytes(digest[:8], 'little')
+        second= int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (first+ i*second)% self.size
+
+    def add(self, key:str)-> None:
+        for position in self._positions(key):
+            self._bits[position>>3]|= 1<<(position&7)
+
+    def __contains__(self, key:str)-> bool:
+        return all(self._bits[position>>3] & (1<<(position&7)) for position in self._positions(key))
+
+
+class ExpiringBloomFilter:
+    """
+    Bloom filters partitioned into time buckets by each key's expiry.
+
+    A key is filed under the bucket of its expiry timestamp and looked up in that same
+    bucket. Whole buckets are dropped once their window has passed, so the structure only
+    ever holds keys that can still matter and never needs per-key deletion.
+    """
+    def __init__(self, capacity:int, error_rate:float, bucket_seconds:int):
+        self.capacity= capacity
+        self.error_rate= error_rate
+        self.bucket_seconds= bucket_seconds
+        self._buckets:Dict[int, BloomFilter]= {}
+        self._lock= threading.Lock()
+
+    def add(self, key:str, expires_at:float, valid_from:float=None)-> None:
+        """
+        Adds key to every bucket overlapping [valid_from, expires_at].
+
+        :param expires_at: Timestamp after which the key can be forgotten.
+        :param valid_from: Earliest expiry the key must match. Defaults to expires_at alone.
+        """
+        first= int((valid_from if valid_from is not None else expires_at)//self.bucket_seconds)
+        last= int(expires_at//self.bucket_seconds)
+        with self._lock:
+            self._purge()
+            for bucket in range(first, last+1):
+                bloom= self._buckets.get(bucket)
+                if bloom is None:
+                    bloom= self._buckets[bucket]= BloomFilter(self.capacity, self.error_rate)
+                bloom.add(key)
+
+    def might_contain(self, key:str, expires_at:float)-> bool:
+        """False means key was definitely never added for this expiry; True needs confirmation."""
+        bloom= self._buckets.get(int(expires_at//self.bucket_seconds))
+        return bloom is not None and key in bloom
+
+    def _purge(self)-> None:
+        """Drops buckets whose whole window lies in the past. Caller holds the lock."""
+        current= int(time.time()//self.bucket_seconds)
+        for bucket in [bucket for bucket in self._buckets if bucket< current]:
+            del self._buckets[bucket]
+
+    def __len__(self)-> int:
+        return len(self._buckets)
@@ -0,0 +1,134 @@
+import os
+import time
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from config.settings.session_manager import get_async_db_session, get_db_session
+from modules.auth.auth_models import ClientUser
+from utils.cache.shared_cache import get_shared_cache
+from utils.cache.ttl_cache import TTLCache
+
+
+class Credential(NamedTuple):
+    """The only columns a login needs."""
+    id: int
+    password_hash: str
+
+INVALIDATION_KEY_PREFIX= 'credential-invalidated:'
+
+
+@lru_cache(maxsize=1)
+def get_credential_cache()-> TTLCache:
+    """
+    Returns the in-process cache of login credentials, keyed by email.
+
+    Invalidation is immediate in the process that makes a change. Other workers only see it
+    once their entry expires, after CREDENTIAL_CACHE_TTL seconds (5 by default): for that
+    long they may still accept a changed password or a deleted account. Set
+    CREDENTIAL_CACHE_SHARED to a Django cache alias to invalidate across workers instead,
+    at the cost of one shared-cache read per cached login.
+    """
+    return TTLCache(
+        maxsize=int(os.getenv('CREDENTIAL_CACHE_SIZE', 10000)),
+        default_ttl=float(os.getenv('CREDENTIAL_CACHE_TTL', 5)),
+    )
+
+@lru_cache(maxsize=1)
+def get_shared_invalidations():
+    """Django cache holding per-email invalidation times, or None when CREDENTIAL_CACHE_SHARED is unset."""
+    alias= os.getenv('CREDENTIAL_CACHE_SHARED')
+    if not alias:
+        return None
+    return get_shared_cache(alias, 'CREDENTIAL_CACHE_SHARED')
+
+def cached_credential(email:str)-> Optional[Credential]:
+    """
+    Live cached credential for email, unless another worker invalidated it after it was cached.
+    Entries are (credential, cached_at) pairs.
+    """
+    entry= get_credential_cache().get(email)
+    if entry is None:
+        return None
+    credential, cached_at= entry
+    shared= get_shared_invalidations()
+    if shared is not None:
+        invalidated_at= shared.get(f'{INVALIDATION_KEY_PREFIX}{email}')
+        if invalidated_at is not None and invalidated_at>= cached_at:
+            get_credential_cache().pop(email)
+            return None
+    return credential
+
+def credential_query(email:str):
+    """Credential columns of the active user registered under email."""
+    return (
+        select(ClientUser.id, ClientUser.password_hash)
+        .where(ClientUser.email_matches(email), ClientUser.deleted_at.is_(None))
+        .limit(1)
+    )
+
+def load_credential(email:str)-> Optional[Credential]:
+    """
+    Returns the credential for email, from the cache or with a two-column query.
+    Unknown emails are not cached, so probing random addresses cannot flush real entries.
+    """
+    credential= cached_credential(email)
+    if credential is None:
+        cached_at= time.time()
+        with get_db_session(read_only=True, pin_key=email) as session:
+            row= session.execute(credential_query(email)).first()
+        if row is None:
+            return None
+        credential= Credential(*row)
+        get_credential_cache().set(email, (credential, cached_at))
+    return credential
+
+async def async_load_credential(email:str)-> Optional[Credential]:
+    """Same as load_credential, querying through the async engine on a miss."""
+    credential= cached_credential(email)
+    if credential is None:
+        cached_at= time.time()
+        async with get_async_db_session(read_only=True, pin_key=email) as session:
+            row= (await session.execute(credential_query(email))).first()
+        if row is None:
+            return None
+        credential= Credential(*row)
+        get_credential_cache().set(email, (credential, cached_at))
+    return credential
+
+def invalidate_credential(email:str)-> None:
+    """Drops the cached credential for email in this process, and in every worker sharing CREDENTIAL_CACHE_SHARED."""
+    get_credential_cache().pop(email)
+    shared= get_shared_invalidations()
+    if shared is not None:
+        # Kept as long as any worker's entry can live; cached_at is taken before the query,
+        # so an entry loaded concurrently with the change is discarded too.
+        shared.set(f'{INVALIDATION_KEY_PREFIX}{email}', time.time(), timeout=get_credential_cache().default_ttl+ 1)
+
+def credential_cache_stats()-> Dict[str, Any]:
+    """Hit rate and occupancy of the credential cache."""
+    return get_credential_cache().stats()
+
+
+@event.listens_for(ClientUser, 'before_update')
+def invalidate_changed_credential(mapper, connection, target:ClientUser)-> None:
+    """
+    Invalidates on ORM flushes that change a password, an email or the soft-delete state.
+    The emails are invalidated again once the transaction commits, so a login racing the
+    update cannot leave the pre-commit credential cached.
+    """
+    state= inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in ('password_hash', 'email', 'deleted_at')):
+        return
+    emails= {target.email, *state.attrs.email.history.deleted}
+    for email in emails:
+        invalidate_credential(email)
+    if state.session is not None:
+        state.session.info.setdefault('stale_credentials', set()).update(emails)
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_committed_credentials(session:Session)-> None:
+    """Second invalidation pass for credentials changed in the committed transaction."""
+    for email in session.info.pop('stale_credentials', ()):
+        invalidate_credential(email)
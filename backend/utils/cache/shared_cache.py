@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.core.exceptions import ImproperlyConfigured
+
+# Backends whose entries never leave the process (or are never stored): useless for sharing.
+PER_PROCESS_BACKENDS= (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def get_shared_cache(alias:str, setting:str)-> BaseCache:
+    """
+    Django cache named alias, checked to actually be shared between workers.
+    :param alias: Key of the cache in CACHES.
+    :param setting: Environment variable that asked for it, named in the error.
+    :raises ImproperlyConfigured: When alias is undefined or a per-process backend.
+    """
+    config= settings.CACHES.get(alias)
+    if config is None:
+        raise ImproperlyConfigured(f'{setting} names cache "{alias}", which is not in CACHES.')
+    if config['BACKEND'] in PER_PROCESS_BACKENDS:
+        raise ImproperlyConfigured(
+            f'{setting} needs a cache shared by every worker, but "{alias}" is per process: set CACHE_URL.'
+        )
+    return caches[alias]
+
+def check_shared_caches()-> None:
+    """
+    Builds every component configured to share state through a cache, so a missing or
+    per-process cache stops the server at startup instead of failing (or silently not
+    sharing) at request time.
+    """
+    from utils.cache.credential_cache import get_shared_invalidations
+    from utils.throttling.login_throttle import get_login_throttle
+
+    get_shared_invalidations()
+    get_login_throttle()
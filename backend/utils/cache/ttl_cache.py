@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU mapping whose entries each carry their own expiry.
+
+    Expiry times are absolute wall-clock timestamps (seconds since the epoch), so callers
+    can expire an entry exactly when the value it caches stops being valid.
+    """
+    def __init__(self, maxsize:int, default_ttl:Optional[float]=None):
+        self.maxsize= maxsize
+        self.default_ttl= default_ttl
+        self._entries:'OrderedDict[Hashable, tuple[float, Any]]'= OrderedDict()
+        self._lock= threading.Lock()
+        self._hits= 0
+        self._misses= 0
+        self._evictions= 0
+
+    def get(self, key:Hashable, default:Any=None)-> Any:
+        """Returns the live value for key, dropping it if it has expired."""
+        with self._lock:
+            entry= self._entries.get(key)
+            if entry is not None:
+                expires_at, value= entry
+                if expires_at> time.time():
+                    self._entries.move_to_end(key)
+                    self._hits+= 1
+                    return value
+                del self._entries[key]
+            self._misses+= 1
+            return default
+
+    def set(self, key:Hashable, value:Any, expires_at:Optional[float]=None)-> None:
+        """
+        Stores value under key until expires_at, evicting the least recently used entry if full.
+
+        :param expires_at: Absolute expiry timestamp. Defaults to now + default_ttl.
+        """
+        if expires_at is None:
+            if self.default_ttl is None:
+                raise ValueError('expires_at is required when the cache has no default TTL.')
+            expires_at= time.time()+ self.default_ttl
+        with self._lock:
+            self._entries[key]= (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries)> self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions+= 1
+
+    def pop(self, key:Hashable)-> Any:
+        """Removes key, returning its value if present."""
+        with self._lock:
+            entry= self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self)-> None:
+        """Drops every entry, keeping counters."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self)-> Dict[str, Any]:
+        """Hit/miss counters and occupancy for monitoring."""
+        with self._lock:
+            lookups= self._hits+ self._misses
+            return {
+                'size':len(self._entries),
+                'maxsize':self.maxsize,
+                'hits':self._hits,
+                'misses':self._misses,
+                'evictions':self._evictions,
+                'hit_rate':self._hits/lookups if lookups else 0.0,
+            }
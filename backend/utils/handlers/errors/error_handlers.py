@@ -1,26 +1,70 @@
 import json
 import logging
+import msgspec
 from functools import wraps
+from asgiref.sync import iscoroutinefunction
 from django.http import JsonResponse
+from utils.hashing.hash_executor import HashingOverloadedError
+from utils.throttling.token_bucket import ThrottledError
 
 logger= logging.getLogger('django')
 
+def overloaded_response(exc:HashingOverloadedError)-> JsonResponse:
+    """Builds a 503 response advising the client when to retry."""
+    response= JsonResponse({
+        'error':'Service temporarily overloaded. Please retry shortly.'
+    }, status=503)
+    response['Retry-After']= str(exc.retry_after)
+    return response
+
+def throttled_response(exc:ThrottledError)-> JsonResponse:
+    """Builds a 429 response advising the client when to retry."""
+    response= JsonResponse({
+        'error':'Too many attempts. Please retry later.'
+    }, status=429)
+    response['Retry-After']= str(exc.retry_after)
+    return response
+
+def exception_response(request, exc:Exception)-> JsonResponse:
+    """Maps an exception escaping a view to its JSON error response."""
+    if isinstance(exc, msgspec.ValidationError):
+        logger.error(f'Invalid request body: {str(exc)}')
+        return JsonResponse({
+            'error':f'Invalid request body: {str(exc)}'
+        }, status=400)
+    if isinstance(exc, (json.JSONDecodeError, msgspec.DecodeError)):
+        logger.error(f'Error decoding JSON in request body: {str(exc)}')
+        return JsonResponse({
+            'error':'Invalid JSON format in request body.'
+        }, status=400)
+    if isinstance(exc, ThrottledError):
+        return throttled_response(exc)
+    if isinstance(exc, HashingOverloadedError):
+        logger.warning(f'Hashing pool saturated, rejecting {request.path}')
+        return overloaded_response(exc)
+    logger.error(f'An internal server error occurred: {str(exc)}', exc_info=exc)
+    return JsonResponse({
+        'error':f'An internal server error occurred: {str(exc)}. Please try again later.'
+    }, status=500)
+
 def handle_exceptions(view_func):
-    """Handles exceptions in routes."""
+    """Handles exceptions in routes. Works for both sync and async views."""
+
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            try:
+                return await view_func(request, *args, **kwargs)
+            except Exception as exc:
+                return exception_response(request, exc)
+
+        return async_wrapper
 
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
         try:
             return view_func(request, *args, **kwargs)
-        except json.JSONDecodeError as decode_err:
-            logger.error(f'Error decoding JSON in request body: {str(decode_err)}')
-            return JsonResponse({
-                'error':'Invalid JSON format in request body.'
-            }, status=400)
         except Exception as exc:
-            logger.error(f'An internal server error occurred: {str(exc)}', exc_info=True)
-            return JsonResponse({
-                'error':f'An internal server error occurred: {str(exc)}. Please try again later.'
-            }, status=500)
+            return exception_response(request, exc)
 
     return wrapper
\ No newline at end of file
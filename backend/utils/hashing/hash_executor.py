@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from utils.metrics.registry import get_metrics_registry
+
+
+class HashingOverloadedError(RuntimeError):
+    """Raised when the hashing pool cannot admit more work."""
+    def __init__(self, retry_after:int):
+        super().__init__('Password hashing capacity exhausted.')
+        self.retry_after= retry_after
+
+
+class HashExecutor:
+    """
+    Bounded worker pool for Argon2 work.
+
+    Concurrency is capped by both the number of workers and a global memory budget,
+    since every running Argon2 call allocates `memory_cost` KiB. Work beyond the running
+    slots waits in a fixed-size queue; once that queue is full, submissions fail fast.
+    Batch jobs (see hash_passwords) share batch_window, which leaves reserved_slots workers
+    to interactive logins however many batches run at once.
+    """
+    def __init__(
+            self,
+            max_workers:int,
+            queue_size:int,
+            memory_cost:int,
+            memory_budget_mib:int,
+            retry_after:int=1,
+            reserved_slots:int=1,
+    ):
+        budget_slots= (memory_budget_mib*1024)//memory_cost
+        self.slots= max(1, min(max_workers, budget_slots))
+        self.batch_slots= max(1, self.slots- reserved_slots)
+        self.batch_window= threading.BoundedSemaphore(self.batch_slots)
+        self.queue_size= queue_size
+        self.retry_after= retry_after
+
+        self._executor= ThreadPoolExecutor(max_workers=self.slots, thread_name_prefix='argon2')
+        self._admission= threading.BoundedSemaphore(self.slots+queue_size)
+        self._lock= threading.Lock()
+        self._queued= 0
+        self._running= 0
+        self._completed= 0
+        self._rejected= 0
+        self._wait_total= 0.0
+        self._wait_max= 0.0
+
+    def submit(
+            self,
+            func:Callable[..., Any],
+            *args,
+            block:bool=False,
+            timeout:Optional[float]=None,
+            **kwargs,
+    )-> Future:
+        """
+        Schedules func on the hashing pool.
+
+        :param func: Callable to run on a hashing worker.
+        :param block: If True, waits for a free slot instead of failing fast.
+        :param timeout: Maximum seconds to wait for a slot when blocking.
+        :returns: Future resolving to func's result.
+        :raises: HashingOverloadedError if the pool and its queue are full.
+        """
+        if not self._admission.acquire(blocking=block, timeout=timeout if block else None):
+            with self._lock:
+                self._rejected+= 1
+            get_metrics_registry().inc('hash_pool_rejected_total')
+            raise HashingOverloadedError(self.retry_after)
+
+        with self._lock:
+            self._queued+= 1
+        try:
+            future= self._executor.submit(self._run, time.perf_counter(), func, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._queued-= 1
+            self._admission.release()
+            raise
+        future.add_done_callback(lambda _: self._admission.release())
+        return future
+
+    def run(self, func:Callable[..., Any], *args, **kwargs)-> Any:
+        """Runs func on the hashing pool and blocks until its result is available."""
+        return self.submit(func, *args, **kwargs).result()
+
+    def _run(self, enqueued_at:float, func:Callable[..., Any], args:tuple, kwargs:dict)-> Any:
+        """Worker-side wrapper recording queue wait time and in-flight counts."""
+        waited= time.perf_counter()- enqueued_at
+        with self._lock:
+            self._queued-= 1
+            self._running+= 1
+            self._wait_total+= waited
+            self._wait_max= max(self._wait_max, waited)
+        metrics= get_metrics_registry()
+        metrics.observe('hash_queue_wait_seconds', waited)
+        started= time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics.observe('hash_run_seconds', time.perf_counter()- started)
+            with self._lock:
+                self._running-= 1
+                self._completed+= 1
+
+    def stats(self)-> Dict[str, Any]:
+        """Snapshot of pool utilisation for monitoring."""
+        with self._lock:
+            started= self._completed+ self._running
+            return {
+                'slots':self.slots,
+                'batch_slots':self.batch_slots,
+                'queue_size':self.queue_size,
+                'queue_depth':self._queued,
+                'in_flight':self._running,
+                'completed':self._completed,
+                'rejected':self._rejected,
+                'avg_wait_ms':(self._wait_total/started)*1000 if started else 0.0,
+                'max_wait_ms':self._wait_max*1000,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_hash_executor()-> HashExecutor:
+    """
+    Returns a singleton hashing pool sized from environment settings.
+    Each Argon2 call already runs `parallelism` lanes on their own threads, so HASH_WORKERS
+    defaults to cpu_count // parallelism: more workers only oversubscribe the cores and
+    stretch every login's hash.
+    """
+    from utils.hashing.password_hasher import get_argon_config
+
+    argon= get_argon_config()
+    return HashExecutor(
+        max_workers=int(os.getenv('HASH_WORKERS', max(1, (os.cpu_count() or 1)// argon.parallelism))),
+        queue_size=int(os.getenv('HASH_QUEUE_SIZE', 32)),
+        memory_cost=argon.memory_cost,
+        memory_budget_mib=int(os.getenv('HASH_MEMORY_BUDGET_MIB', 512)),
+        retry_after=int(os.getenv('HASH_RETRY_AFTER', 1)),
+        reserved_slots=int(os.getenv('HASH_BULK_RESERVED_SLOTS', 1)),
+    )
@@ -0,0 +1,130 @@
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, NamedTuple, Tuple
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError
+
+
+HASH_TYPES= {
+    'argon2id':Type.ID,
+    'argon2i':Type.I,
+    'argon2d':Type.D,
+}
+LEGACY_VERSION= 0x10  # Hashes without a `v=` segment predate Argon2 v1.3
+MAX_PROFILES= int(os.getenv('ARGON2_MAX_PROFILES', 32))
+
+
+class HashParams(NamedTuple):
+    """Argon2 parameters encoded in a hash's `$argon2id$v=19$m=...,t=...,p=...` header."""
+    algorithm_type: Type
+    version: int
+    memory_cost: int
+    time_cost: int
+    parallelism: int
+
+
+def split_hash(hashed:str)-> Tuple[str, str, str]:
+    """
+    Splits an encoded Argon2 hash into header, salt and digest segments.
+
+    :param hashed: Encoded Argon2 hash string.
+    :returns: Tuple (header, salt, digest) with salt and digest still base64 encoded.
+    :raises: InvalidHashError if the string is not an encoded Argon2 hash.
+    """
+    header, separator, rest= hashed.rpartition('$')
+    header, separator_salt, salt= header.rpartition('$')
+    if not separator or not separator_salt:
+        raise InvalidHashError(hashed)
+    return header, salt, rest
+
+
+@lru_cache(maxsize=int(os.getenv('ARGON2_HEADER_CACHE_SIZE', 64)))
+def parse_hash_header(header:str)-> HashParams:
+    """
+    Parses an Argon2 header. Cached, since a fleet only ever has a handful of distinct headers.
+
+    :param header: Hash prefix up to, excluding, the salt segment.
+    :returns: HashParams encoded in the header.
+    :raises: InvalidHashError for malformed headers.
+    """
+    segments= header.split('$')
+    try:
+        if len(segments)==4 and segments[2].startswith('v='):
+            _, name, version, params= segments
+            version= int(version[2:])
+        elif len(segments)==3:
+            _, name, params= segments
+            version= LEGACY_VERSION
+        else:
+            raise ValueError(header)
+        values= dict(item.split('=', 1) for item in params.split(','))
+        return HashParams(
+            algorithm_type=HASH_TYPES[name],
+            version=version,
+            memory_cost=int(values['m']),
+            time_cost=int(values['t']),
+            parallelism=int(values['p']),
+        )
+    except (ValueError, KeyError) as exc:
+        raise InvalidHashError(header) from exc
+
+def parse_hash_params(hashed:str)-> HashParams:
+    """Returns the Argon2 parameters a hash was created with."""
+    return parse_hash_header(split_hash(hashed)[0])
+
+def decoded_length(segment:str)-> int:
+    """Byte length of an unpadded base64 segment."""
+    return len(segment)*3//4
+
+
+class HasherRegistry:
+    """Prebuilt PasswordHasher instances keyed by the parameters they hash with."""
+    def __init__(self, salt_len:int, hash_len:int):
+        self._salt_len= salt_len
+        self._hash_len= hash_len
+        self._hashers:Dict[HashParams, PasswordHasher]= {}
+        self._lock= threading.Lock()
+
+    def register(self, params:HashParams, hasher:PasswordHasher)-> PasswordHasher:
+        """Adds an existing hasher for params, keeping the first one registered."""
+        with self._lock:
+            return self._hashers.setdefault(params, hasher)
+
+    def hasher_for(self, params:HashParams)-> PasswordHasher:
+        """
+        Returns the hasher matching params, building it once on first use.
+
+        :param params: Parameters parsed from a stored hash.
+        :returns: PasswordHasher configured exactly as the hash was created.
+        """
+        hasher= self._hashers.get(params)
+        if hasher is not None:
+            return hasher
+
+        hasher= PasswordHasher(
+            time_cost=params.time_cost,
+            memory_cost=params.memory_cost,
+            parallelism=params.parallelism,
+            hash_len=self._hash_len,
+            salt_len=self._salt_len,
+            type=params.algorithm_type,
+        )
+        if len(self._hashers)>= MAX_PROFILES:
+            return hasher
+        return self.register(params, hasher)
+
+    def hasher_for_hash(self, hashed:str)-> PasswordHasher:
+        """Returns the hasher matching the parameters encoded in hashed."""
+        return self.hasher_for(parse_hash_params(hashed))
+
+
+@lru_cache(maxsize=1)
+def get_hasher_registry()-> HasherRegistry:
+    """Returns a singleton registry seeded with the current configuration's hasher."""
+    from utils.hashing.password_hasher import get_argon_config
+
+    config= get_argon_config()
+    registry= HasherRegistry(salt_len=config.salt_len, hash_len=config.hash_len)
+    registry.register(config.params, config.hasher)
+    return registry
@@ -1,9 +1,22 @@
+import asyncio
+import json
+import logging
+import os
 from dataclasses import dataclass
-from functools import lru_cache
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 from argon2 import PasswordHasher, Type
+from argon2.low_level import ARGON2_VERSION
 from argon2.exceptions import HashingError, VerifyMismatchError, InvalidHashError
 from secrets import token_bytes
+from utils.hashing.hash_executor import get_hash_executor
+from utils.hashing.hasher_registry import HashParams, decoded_length, get_hasher_registry, parse_hash_header, split_hash
 
+logger= logging.getLogger('django')
+
+DEFAULT_PROFILE_PATH= Path(__file__).resolve().parent.parent.parent / 'argon2_profile.json'
+PROFILE_FIELDS= ('time_cost', 'memory_cost', 'parallelism')
 
 @dataclass(frozen=True)
 class Argon2Config:
@@ -14,21 +27,64 @@ class Argon2Config:
     salt_len: int=16                # Salt length (recommended)
     algorithm_type: Type=Type.ID    # Argon2 algorithm variant (recommended)
 
-    @property
+    hash_len: int=32                # Digest length (argon2-cffi default)
+
+    @cached_property
     def hasher(self)-> PasswordHasher:
         """Cached property for PasswordHasher instance."""
         return PasswordHasher(
             time_cost=self.time_cost,
             memory_cost=self.memory_cost,
             parallelism=self.parallelism,
+            hash_len=self.hash_len,
             salt_len=self.salt_len,
             type=self.algorithm_type,
         )
 
+    @cached_property
+    def params(self)-> HashParams:
+        """Header parameters every hash made with this configuration carries."""
+        return HashParams(
+            algorithm_type=self.algorithm_type,
+            version=ARGON2_VERSION,
+            memory_cost=self.memory_cost,
+            time_cost=self.time_cost,
+            parallelism=self.parallelism,
+        )
+
+
+def argon_profile_path()-> Path:
+    """Location of the host tuning profile written by the argon2_calibrate command."""
+    return Path(os.getenv('ARGON2_PROFILE_PATH', DEFAULT_PROFILE_PATH))
+
+def load_argon_profile(path:Optional[Path]=None)-> Optional[Dict[str, Any]]:
+    """
+    Loads Argon2 cost parameters from a calibrated profile file.
+
+    :param path: Profile location, defaults to argon_profile_path().
+    :returns: Mapping of time_cost, memory_cost and parallelism, or None if no usable profile exists.
+    """
+    path= path or argon_profile_path()
+    if not path.exists():
+        return None
+    try:
+        profile= json.loads(path.read_text())
+        params= {field: int(profile[field]) for field in PROFILE_FIELDS}
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning(f'Ignoring unreadable Argon2 profile {path}: {str(exc)}')
+        return None
+    if any(value<1 for value in params.values()):
+        logger.warning(f'Ignoring Argon2 profile {path}: cost parameters must be positive')
+        return None
+    return params
+
 
 @lru_cache(maxsize=1)
 def get_argon_config()-> Argon2Config:
-    """Returns a singleton Argon2 configuration instance."""
+    """Returns a singleton Argon2 configuration instance, tuned by the host profile if present."""
+    profile= load_argon_profile()
+    if profile:
+        return Argon2Config(**profile)
     return Argon2Config()
 
 
@@ -38,7 +94,7 @@ def hash_password(
         encoding:str='utf-8',
 )-> str:
     """
-    Hashes a password using Argon2 configurable settings.
+    Hashes a password using Argon2 configurable settings on the bounded hashing pool.
 
     :param password: Password string to be hashed.
     :param custom_salt: Optional pre-generated salt (16-byte recommended).
@@ -48,14 +104,9 @@ def hash_password(
     :returns: Argon2 hash string.
 
     :raises: HashingError if hashing failure.
+    :raises: HashingOverloadedError if the hashing pool is saturated.
     """
-
-    config= get_argon_config()
-    try:
-        salt= custom_salt if custom_salt else token_bytes(config.salt_len)
-        return config.hasher.hash(password.encode(encoding), salt=salt)
-    except HashingError as hash_error:
-        raise ValueError(f'Password hashing failed: {str(hash_error)}') from hash_error
+    return get_hash_executor().run(_hash_password, password, custom_salt, encoding)
 
 def verify_password(
         password:str,
@@ -64,7 +115,7 @@ def verify_password(
         return_hash:bool=False,
 )-> bool | tuple[bool, str]:
     """
-    Verifies a password against an Argon2 hash with additional options.
+    Verifies a password against an Argon2 hash with additional options on the bounded hashing pool.
 
     :param password: Password string to be verified against Argon2 hash.
     :param hashed_password: Hashed Argon2 string to be verified against.
@@ -73,14 +124,83 @@ def verify_password(
 
     :returns: Verification result or tuple with updated hash.
     :raises: InvalidHash for malformed hashes.
+    :raises: HashingOverloadedError if the hashing pool is saturated.
+    """
+    return get_hash_executor().run(_verify_password, password, hashed_password, encoding, return_hash)
+
+def hash_passwords(passwords:List[str], encoding:str='utf-8')-> List[str]:
+    """
+    Hashes many passwords in parallel, for batch jobs.
+    All batches together keep at most batch_slots jobs in flight, leaving HASH_BULK_RESERVED_SLOTS
+    workers and the whole queue to interactive logins.
+
+    :param passwords: Password strings to be hashed.
+    :param encoding: Codec in which passwords are to be encoded.
+    :returns: Argon2 hash strings, in input order.
     """
+    executor= get_hash_executor()
+    window= executor.batch_window
+    futures= []
+    for password in passwords:
+        window.acquire()
+        try:
+            future= executor.submit(_hash_password, password, None, encoding, block=True)
+        except Exception:
+            window.release()
+            raise
+        future.add_done_callback(lambda _: window.release())
+        futures.append(future)
+    return [future.result() for future in futures]
+
+async def async_hash_password(password:str, encoding:str='utf-8')-> str:
+    """Awaitable hash_password. Hashing runs on the bounded pool, never on the event loop."""
+    return await asyncio.wrap_future(get_hash_executor().submit(_hash_password, password, None, encoding))
+
+async def async_verify_password(password:str, hashed_password:str, encoding:str='utf-8')-> bool:
+    """Awaitable verify_password. Verification runs on the bounded pool, never on the event loop."""
+    return await asyncio.wrap_future(get_hash_executor().submit(_verify_password, password, hashed_password, encoding))
+
+def needs_rehash(hashed:str)-> bool:
+    """
+    Checks if Argon2 hash needs to be re-hashed.
 
+    :param hashed: Hashed Argon2 string.
+    :returns: True if hashed string fails check | False if check pass.
+    """
+    config= get_argon_config()
+    header, salt, digest= split_hash(hashed)
+    return (
+        parse_hash_header(header)!= config.params
+        or decoded_length(salt)!= config.salt_len
+        or decoded_length(digest)!= config.hash_len
+    )
+
+def _hash_password(
+        password:str,
+        custom_salt:bytes=None,
+        encoding:str='utf-8',
+)-> str:
+    """Hashes a password inline. Runs on a hashing worker, see hash_password."""
     config= get_argon_config()
     try:
-        is_valid= config.hasher.verify(hashed_password, password.encode(encoding))
+        salt= custom_salt if custom_salt else token_bytes(config.salt_len)
+        return config.hasher.hash(password.encode(encoding), salt=salt)
+    except HashingError as hash_error:
+        raise ValueError(f'Password hashing failed: {str(hash_error)}') from hash_error
+
+def _verify_password(
+        password:str,
+        hashed_password:str,
+        encoding:str='utf-8',
+        return_hash:bool=False,
+)-> bool | tuple[bool, str]:
+    """Verifies a password inline. Runs on a hashing worker, see verify_password."""
+    try:
+        hasher= get_hasher_registry().hasher_for_hash(hashed_password)
+        is_valid= hasher.verify(hashed_password, password.encode(encoding))
         if return_hash:
             if needs_rehash(hashed_password):
-                return is_valid, hash_password(password)
+                return is_valid, _hash_password(password, encoding=encoding)
             return is_valid, hashed_password
         return is_valid
     except VerifyMismatchError:
@@ -89,16 +209,6 @@ def verify_password(
         # Log invalid hash format
         raise ValueError(f'Invalid hash format: {str(invalid_hash)}')
 
-def needs_rehash(hashed:str)-> bool:
-    """
-    Checks if Argon2 hash needs to be re-hashed.
-
-    :param hashed: Hashed Argon2 string.
-    :returns: True if hashed string fails check | False if check pass.
-    """
-    config= get_argon_config()
-    return config.hasher.check_needs_rehash(hashed)
-
 
 #test= hash_password('password')
 #print(test)
\ No newline at end of file
@@ -0,0 +1,110 @@
+import atexit
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Tuple
+from sqlalchemy import bindparam, update
+
+from config.settings.session_manager import get_db_session
+from modules.auth.auth_models import ClientUser
+from utils.cache.credential_cache import invalidate_credential
+from utils.hashing.hash_executor import HashingOverloadedError
+from utils.hashing.password_hasher import hash_password
+
+logger= logging.getLogger('django')
+
+
+class RehashQueue:
+    """
+    Collects stale Argon2 hashes seen at login and rewrites them in the background.
+
+    Entries are keyed by user id, so repeated logins before a flush collapse into a single
+    re-hash. Each flush writes all new hashes with one executemany UPDATE, guarded by the old
+    hash so a concurrent password change is never overwritten.
+    """
+    def __init__(self, batch_size:int, flush_interval:float):
+        self.batch_size= batch_size
+        self.flush_interval= flush_interval
+        self._pending:Dict[int, Tuple[str, str, str]]= {}
+        self._lock= threading.Lock()
+        self._wakeup= threading.Event()
+        self._worker= None
+
+    def enqueue(self, user_id:int, old_hash:str, password:str, email:str)-> None:
+        """
+        Schedules a re-hash for user_id. Never blocks on hashing or I/O.
+
+        :param user_id: Primary key of the user whose hash is stale.
+        :param old_hash: Hash currently stored, used to guard the update.
+        :param password: Verified plaintext password to re-hash.
+        :param email: Login email, whose cached credential is invalidated once the new hash commits.
+        """
+        with self._lock:
+            self._pending[user_id]= (old_hash, password, email)
+            if self._worker is None:
+                self._worker= threading.Thread(target=self._run, name='rehash-queue', daemon=True)
+                self._worker.start()
+            if len(self._pending)>= self.batch_size:
+                self._wakeup.set()
+
+    def _run(self)-> None:
+        """Worker loop flushing on interval or when a batch fills up."""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as exc:
+                logger.error(f'Background rehash flush failed: {str(exc)}', exc_info=True)
+
+    def flush(self)-> int:
+        """
+        Re-hashes and persists every pending entry.
+
+        :returns: Number of users whose hash update was attempted.
+        """
+        with self._lock:
+            batch, self._pending= self._pending, {}
+        if not batch:
+            return 0
+
+        rows= []
+        for user_id, (old_hash, password, _) in batch.items():
+            try:
+                rows.append({
+                    'user_id':user_id,
+                    'old_hash':old_hash,
+                    'new_hash':hash_password(password),
+                })
+            except HashingOverloadedError:
+                # Logins own the hashing pool; the next login will queue this user again.
+                continue
+        if not rows:
+            return 0
+
+        table= ClientUser.__table__
+        statement= (
+            update(table)
+            .where(table.c.id==bindparam('user_id'), table.c.password_hash==bindparam('old_hash'))
+            .values(password_hash=bindparam('new_hash'))
+        )
+        with get_db_session() as session:
+            session.execute(statement, rows)
+        # This Core UPDATE fires no ORM events: invalidate the cached credentials explicitly.
+        for row in rows:
+            invalidate_credential(batch[row['user_id']][2])
+
+        logger.info(f'Re-hashed {len(rows)} password(s) with current Argon2 parameters')
+        return len(rows)
+
+
+@lru_cache(maxsize=1)
+def get_rehash_queue()-> RehashQueue:
+    """Returns a singleton rehash queue, flushed one last time at interpreter exit."""
+    queue= RehashQueue(
+        batch_size=int(os.getenv('REHASH_BATCH_SIZE', 100)),
+        flush_interval=float(os.getenv('REHASH_FLUSH_INTERVAL', 2.0)),
+    )
+    atexit.register(queue.flush)
+    return queue
@@ -0,0 +1,152 @@
+import logging
+import smtplib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from sqlalchemy import select
+
+from config.settings.session_manager import get_db_session
+from modules.mail.mail_models import EmailOutbox
+
+logger= logging.getLogger('django')
+
+MAX_BACKOFF= timedelta(hours=1)
+CONNECT_RETRY_DELAY= timedelta(seconds=60)
+
+
+def queue_email(
+        recipient:str,
+        subject:str,
+        template:str,
+        context:Dict[str, Any],
+        session=None,
+)-> EmailOutbox:
+    """
+    Writes an email to the outbox instead of sending it inline.
+
+    :param recipient: Destination address.
+    :param subject: Email subject line.
+    :param template: Template base name, rendered as `<template>.txt` and `<template>.html` at delivery.
+    :param context: JSON-serializable template context.
+    :param session: Open session to write in, so the email commits with the caller's transaction.
+    :returns: Pending outbox row.
+    """
+    message= EmailOutbox(
+        recipient=recipient,
+        subject=subject,
+        template=template,
+        context=context,
+        status='pending',
+        attempts=0,
+    )
+    if session is not None:
+        session.add(message)
+    else:
+        with get_db_session() as session:
+            session.add(message)
+    return message
+
+def build_message(row:EmailOutbox, connection)-> EmailMultiAlternatives:
+    """Renders an outbox row into a multipart email bound to an open connection."""
+    message= EmailMultiAlternatives(
+        subject=row.subject,
+        body=render_to_string(f'{row.template}.txt', row.context),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[row.recipient],
+        connection=connection,
+    )
+    message.attach_alternative(render_to_string(f'{row.template}.html', row.context), 'text/html')
+    return message
+
+def finish(row:EmailOutbox, status:str)-> None:
+    """
+    Closes a row for good. Its context is cleared: it can hold secrets such as the
+    verification link, which must not outlive the delivery in the table.
+    """
+    row.status= status
+    row.context= {}
+
+def schedule_retry(row:EmailOutbox, exc:Exception, now:datetime, max_attempts:int, backoff:float)-> None:
+    """Records a failed attempt and schedules the next one with exponential backoff."""
+    row.attempts+= 1
+    row.last_error= str(exc)[:2000]
+    if row.attempts>= max_attempts:
+        finish(row, 'failed')
+        logger.error(f'Giving up on outbox email {row.id} to {row.recipient}: {str(exc)}')
+        return
+    delay= min(timedelta(seconds=backoff*2**(row.attempts-1)), MAX_BACKOFF)
+    row.next_attempt_at= now+ delay
+
+def defer(row:EmailOutbox, exc:Exception, now:datetime)-> None:
+    """Puts a row back for CONNECT_RETRY_DELAY without spending an attempt: it was never tried."""
+    row.last_error= str(exc)[:2000]
+    row.next_attempt_at= now+ CONNECT_RETRY_DELAY
+
+def is_connection_error(exc:Exception)-> bool:
+    """Whether exc lost the SMTP connection rather than rejected one message."""
+    # SMTPException derives from OSError: refusals of a single message are not connection errors.
+    return isinstance(exc, smtplib.SMTPServerDisconnected) or (
+        isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+    )
+
+def deliver_outbox_batch(batch_size:int=50, max_attempts:int=5, backoff:float=30.0)-> Dict[str, int]:
+    """
+    Sends up to batch_size due emails over a single SMTP connection.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so several workers can drain the
+    outbox concurrently without sending the same email twice. When the SMTP server is
+    unreachable, or drops the connection partway, the rest of the batch is deferred without
+    spending attempts: an outage of any length delays emails but never fails them.
+
+    :param batch_size: Maximum emails claimed per batch.
+    :param max_attempts: Attempts before an email is marked failed.
+    :param backoff: Base retry delay in seconds, doubled after every failed attempt.
+    :returns: Counts of claimed, sent, failed and deferred emails.
+    """
+    now= datetime.now(timezone.utc)
+    result= {'claimed':0, 'sent':0, 'failed':0, 'deferred':0}
+    with get_db_session() as session:
+        rows= session.execute(
+            select(EmailOutbox)
+            .where(EmailOutbox.status=='pending', EmailOutbox.next_attempt_at<= now)
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        result['claimed']= len(rows)
+        if not rows:
+            return result
+
+        connection= get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as exc:
+            logger.error(f'SMTP connection failed, deferring {len(rows)} outbox email(s): {str(exc)}')
+            for row in rows:
+                defer(row, exc, now)
+            result['deferred']= len(rows)
+            return result
+
+        try:
+            for index, row in enumerate(rows):
+                try:
+                    build_message(row, connection).send()
+                    finish(row, 'sent')
+                    row.sent_at= datetime.now(timezone.utc)
+                    result['sent']+= 1
+                except Exception as exc:
+                    # The row that hit the error was tried and spends its attempt.
+                    schedule_retry(row, exc, now, max_attempts, backoff)
+                    result['failed']+= 1
+                    if is_connection_error(exc):
+                        unsent= rows[index+ 1:]
+                        logger.error(f'SMTP connection lost, deferring {len(unsent)} outbox email(s): {str(exc)}')
+                        for unsent_row in unsent:
+                            defer(unsent_row, exc, now)
+                        result['deferred']+= len(unsent)
+                        break
+        finally:
+            connection.close()
+    return result
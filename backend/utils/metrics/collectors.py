@@ -0,0 +1,74 @@
+from typing import Any, Dict, Iterable, Tuple
+
+from utils.metrics.registry import MetricsRegistry
+
+Gauge= Tuple[str, float, Dict[str, Any]]
+
+
+def hash_pool_gauges()-> Iterable[Gauge]:
+    """Hashing pool occupancy. Rejections are the hash_pool_rejected_total counter."""
+    from utils.hashing.hash_executor import get_hash_executor
+
+    stats= get_hash_executor().stats()
+    yield 'hash_pool_slots', stats['slots'], {}
+    yield 'hash_pool_batch_slots', stats['batch_slots'], {}
+    yield 'hash_pool_queue_depth', stats['queue_depth'], {}
+    yield 'hash_pool_in_flight', stats['in_flight'], {}
+
+def login_throttle_gauges()-> Iterable[Gauge]:
+    """Login throttling decisions and current lockouts."""
+    from utils.throttling.login_throttle import get_login_throttle
+
+    for name, value in get_login_throttle().stats().items():
+        if value is not None:
+            yield f'login_throttle_{name}', value, {}
+
+def cache_gauges()-> Iterable[Gauge]:
+    """Hit/miss counters of the login credential and token claims caches."""
+    from utils.cache.credential_cache import credential_cache_stats
+    from utils.tokens.generate_token import token_cache_stats
+
+    for cache, stats in (('credentials', credential_cache_stats()), ('token_claims', token_cache_stats())):
+        for name in ('size', 'hits', 'misses', 'evictions'):
+            yield f'cache_{name}', stats[name], {'cache':cache}
+
+def db_pool_gauges()-> Iterable[Gauge]:
+    """Connection pool occupancy of every instrumented engine."""
+    from utils.metrics.pool_timing import instrumented_pools, pool_status
+
+    for label, engine in instrumented_pools().items():
+        for name, value in pool_status(engine).items():
+            yield f'db_pool_{name}', value, {'engine':label}
+
+def replica_gauges()-> Iterable[Gauge]:
+    """Health and replication lag of each configured read replica."""
+    from config.settings.replicas import get_replica_router
+
+    for name, stats in get_replica_router().stats():
+        yield 'db_replica_healthy', stats['healthy'], {'replica':name}
+        if stats['lag_seconds'] is not None:
+            yield 'db_replica_lag_seconds', stats['lag_seconds'], {'replica':name}
+
+def register_auth_collectors(registry:MetricsRegistry)-> None:
+    """Registers the auth gauges and the HELP text of every auth metric."""
+    registry.describe('http_request_duration_seconds', 'Request latency by route, method and status.')
+    registry.describe('http_request_phase_seconds', 'Time spent in each phase of a request, by route.')
+    registry.describe('db_pool_checkout_seconds', 'Time waiting for a database connection from the pool.')
+    registry.describe('db_pool_checkout_timeouts_total', 'Checkouts that gave up after DB_POOL_TIMEOUT.')
+    registry.describe('db_pool_checkouts_total', 'Connections handed out by the pool.')
+    registry.describe('db_pool_connections_opened_total', 'New database connections opened by the pool.')
+    registry.describe('db_pool_connections_closed_total', 'Database connections closed by the pool.')
+    registry.describe('db_pool_invalidations_total', 'Connections invalidated after errors or failed pre-pings.')
+    registry.describe('db_pool_checked_out', 'Connections currently in use.')
+    registry.describe('db_pool_overflow', 'Connections open beyond DB_POOL_SIZE.')
+    registry.describe('db_reads_total', 'Read-only sessions by target (replica or primary) and routing reason.')
+    registry.describe('db_replica_healthy', '1 while the replica is in the read rotation.')
+    registry.describe('db_replica_lag_seconds', 'Replication lag measured at the last health check.')
+    registry.describe('hash_pool_rejected_total', 'Hashing jobs refused because the pool and its queue were full.')
+    registry.describe('hash_queue_wait_seconds', 'Time Argon2 work waited for a hashing worker.')
+    registry.describe('hash_run_seconds', 'Time spent running Argon2 on a hashing worker.')
+    registry.register_collector(hash_pool_gauges)
+    registry.register_collector(login_throttle_gauges)
+    registry.register_collector(cache_gauges)
+    registry.register_collector(db_pool_gauges)
+    registry.register_collector(replica_gauges)
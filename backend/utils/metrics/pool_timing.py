@@ -0,0 +1,83 @@
+import time
+from typing import Dict
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from utils.metrics.registry import get_metrics_registry
+
+_instrumented:Dict[str, Engine]= {}
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool recording how long each checkout waits for a connection, and checkouts that time out.
+    instrument_pool sets engine_label per engine, so the primary's and each replica's pools report apart.
+    """
+    engine_label= 'sync'    # Until instrumented
+
+    def recreate(self):
+        # engine.dispose() swaps in a recreated pool: keep its label.
+        pool= super().recreate()
+        pool.engine_label= self.engine_label
+        return pool
+
+    def _do_get(self):
+        started= time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            get_metrics_registry().inc('db_pool_checkout_timeouts_total', engine=self.engine_label)
+            raise
+        finally:
+            get_metrics_registry().observe(
+                'db_pool_checkout_seconds', time.perf_counter()- started, engine=self.engine_label,
+            )
+
+
+class TimedAsyncAdaptedQueuePool(TimedQueuePool, AsyncAdaptedQueuePool):
+    """Same for the asyncio engine's pool."""
+    engine_label= 'async'
+
+
+def instrument_pool(engine:Engine, label:str)-> None:
+    """
+    Counts connection lifecycle events of engine's pool and exposes its occupancy as gauges.
+    :param engine: Sync engine, or the `sync_engine` of an async one.
+    :param label: Value of the `engine` label on every pool metric.
+    """
+    registry= get_metrics_registry()
+    if isinstance(engine.pool, TimedQueuePool):
+        engine.pool.engine_label= label
+
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        registry.inc('db_pool_connections_opened_total', engine=label)
+
+    @event.listens_for(engine, 'close')
+    def on_close(dbapi_connection, connection_record):
+        registry.inc('db_pool_connections_closed_total', engine=label)
+
+    @event.listens_for(engine, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        registry.inc('db_pool_checkouts_total', engine=label)
+
+    @event.listens_for(engine, 'invalidate')
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        registry.inc('db_pool_invalidations_total', engine=label)
+
+    _instrumented[label]= engine
+
+def pool_status(engine:Engine)-> Dict[str, int]:
+    """Occupancy of engine's QueuePool. QueuePool reports overflow negative until the base pool fills: clamp it."""
+    pool= engine.pool
+    return {
+        'size':pool.size(),
+        'checked_out':pool.checkedout(),
+        'checked_in':pool.checkedin(),
+        'overflow':max(pool.overflow(), 0),
+    }
+
+def instrumented_pools()-> Dict[str, Engine]:
+    return dict(_instrumented)
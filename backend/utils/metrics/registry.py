@@ -0,0 +1,202 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.metrics.histogram import DEFAULT_BOUNDS, Histogram
+
+logger= logging.getLogger('django')
+
+Labels= Tuple[Tuple[str, str], ...]
+# A collector returns (metric name, value, labels) gauges, read at snapshot time.
+Collector= Callable[[], Iterable[Tuple[str, float, Dict[str, Any]]]]
+
+
+def label_key(labels:Dict[str, Any])-> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def escape_label(value:str)-> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def format_labels(labels:Labels, **extra)-> str:
+    pairs= list(labels)+ [(name, str(value)) for name, value in extra.items()]
+    if not pairs:
+        return ''
+    return '{'+ ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs)+ '}'
+
+def pid_alive(pid:int)-> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    """
+    In-process histograms, counters and collected gauges, rendered in the Prometheus text format.
+
+    Under multi-worker servers, set METRICS_DIR to a directory shared by the workers (and
+    emptied on deploy). Every process then writes its snapshot to `<pid>.json` there every
+    flush_interval seconds and at exit, and the metrics endpoint merges all snapshots.
+    Histograms and counters of exited workers keep counting so totals never go backwards;
+    their gauges are dropped. Gauges carry a `pid` label since they are per process.
+    """
+    def __init__(self, directory:Optional[str]=None, flush_interval:float=5.0):
+        self.directory= Path(directory) if directory else None
+        self.flush_interval= flush_interval
+        self._histograms:Dict[Tuple[str, Labels], Histogram]= {}
+        self._counters:Dict[Tuple[str, Labels], float]= {}
+        self._help:Dict[str, str]= {}
+        self._collectors:List[Collector]= []
+        self._lock= threading.Lock()
+        self._flusher:Optional[threading.Thread]= None
+
+    def describe(self, name:str, help_text:str)-> None:
+        """Sets the HELP line of a metric."""
+        self._help[name]= help_text
+
+    def observe(self, name:str, value:float, **labels)-> None:
+        """Records value, in seconds, in the histogram name{labels}."""
+        key= (name, label_key(labels))
+        histogram= self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram= self._histograms.setdefault(key, Histogram())
+            self._start_flusher()
+        histogram.observe(value)
+
+    def inc(self, name:str, amount:float=1, **labels)-> None:
+        """Adds amount to the counter name{labels}."""
+        key= (name, label_key(labels))
+        with self._lock:
+            self._counters[key]= self._counters.get(key, 0)+ amount
+        self._start_flusher()
+
+    def register_collector(self, collector:Collector)-> None:
+        """Adds a callable whose gauges are read at every snapshot."""
+        self._collectors.append(collector)
+
+    def snapshot(self)-> Dict[str, Any]:
+        """This process's metrics, JSON-serializable."""
+        with self._lock:
+            histograms= list(self._histograms.items())
+            counters= list(self._counters.items())
+        gauges= []
+        for collector in self._collectors:
+            try:
+                gauges.extend([name, label_key(labels), value] for name, value, labels in collector())
+            except Exception as exc:
+                logger.warning(f'Metrics collector {getattr(collector, "__name__", collector)} failed: {str(exc)}')
+        return {
+            'pid':os.getpid(),
+            'bounds':list(DEFAULT_BOUNDS),
+            'histograms':[[name, labels, data.snapshot()] for (name, labels), data in histograms],
+            'counters':[[name, labels, value] for (name, labels), value in counters],
+            'gauges':gauges,
+        }
+
+    def write_snapshot(self)-> None:
+        """Atomically replaces this process's snapshot file."""
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path= self.directory / f'{os.getpid()}.json'
+        temp= path.with_suffix('.tmp')
+        temp.write_text(json.dumps(self.snapshot()))
+        os.replace(temp, path)
+
+    def _start_flusher(self)-> None:
+        if self.directory is None or self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher= threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+            self._flusher.start()
+        atexit.register(self.write_snapshot)
+
+    def _flush_loop(self)-> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.write_snapshot()
+            except Exception as exc:
+                logger.warning(f'Writing metrics snapshot failed: {str(exc)}')
+
+    def snapshots(self)-> List[Dict[str, Any]]:
+        """Snapshots of every process sharing the directory, this one freshly taken."""
+        if self.directory is None:
+            return [self.snapshot()]
+        self.write_snapshot()
+        snapshots= []
+        for path in self.directory.glob('*.json'):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue    # being replaced, or a crashed writer's partial file
+        return snapshots
+
+    def render(self)-> str:
+        """Merged metrics in the Prometheus text exposition format."""
+        histograms:Dict[str, Dict[Labels, Histogram]]= {}
+        counters:Dict[str, Dict[Labels, float]]= {}
+        gauges:Dict[str, List[Tuple[Labels, int, float]]]= {}
+        multiprocess= self.directory is not None
+        for snapshot in self.snapshots():
+            if snapshot.get('bounds')!= list(DEFAULT_BOUNDS):
+                continue
+            for name, labels, data in snapshot['histograms']:
+                series= histograms.setdefault(name, {})
+                key= tuple(tuple(pair) for pair in labels)
+                series.setdefault(key, Histogram()).merge(data['counts'], data['sum'])
+            for name, labels, value in snapshot['counters']:
+                series= counters.setdefault(name, {})
+                key= tuple(tuple(pair) for pair in labels)
+                series[key]= series.get(key, 0)+ value
+            if multiprocess and not pid_alive(snapshot['pid']):
+                continue
+            for name, labels, value in snapshot['gauges']:
+                gauges.setdefault(name, []).append((tuple(tuple(pair) for pair in labels), snapshot['pid'], value))
+
+        lines= []
+        for name in sorted(histograms):
+            lines.extend(self._header(name, 'histogram'))
+            for labels, histogram in sorted(histograms[name].items()):
+                cumulative= 0
+                for bound, count in zip(histogram.bounds, histogram.counts):
+                    cumulative+= count
+                    lines.append(f'{name}_bucket{format_labels(labels, le=f"{bound:.6g}")} {cumulative}')
+                lines.append(f'{name}_bucket{format_labels(labels, le="+Inf")} {histogram.count}')
+                lines.append(f'{name}_sum{format_labels(labels)} {histogram.sum}')
+                lines.append(f'{name}_count{format_labels(labels)} {histogram.count}')
+        for name in sorted(counters):
+            lines.extend(self._header(name, 'counter'))
+            for labels, value in sorted(counters[name].items()):
+                lines.append(f'{name}{format_labels(labels)} {value}')
+        for name in sorted(gauges):
+            lines.extend(self._header(name, 'gauge'))
+            for labels, pid, value in sorted(gauges[name], key=lambda gauge: (gauge[0], gauge[1])):
+                extra= {'pid':pid} if multiprocess else {}
+                lines.append(f'{name}{format_labels(labels, **extra)} {value}')
+        return '\n'.join(lines)+ '\n'
+
+    def _header(self, name:str, kind:str)-> List[str]:
+        help_text= self._help.get(name)
+        return ([f'# HELP {name} {help_text}'] if help_text else [])+ [f'# TYPE {name} {kind}']
+
+
+@lru_cache(maxsize=1)
+def get_metrics_registry()-> MetricsRegistry:
+    """Process-wide metrics registry; METRICS_DIR enables multi-worker aggregation."""
+    return MetricsRegistry(
+        directory=os.getenv('METRICS_DIR') or None,
+        flush_interval=float(os.getenv('METRICS_FLUSH_INTERVAL', 5)),
+    )
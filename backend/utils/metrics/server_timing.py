@@ -0,0 +1,87 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from utils.metrics.registry import get_metrics_registry
+
+# Phases timed during the current request, in order; None outside a timed request.
+_phases:ContextVar[Optional[List[Tuple[str, float]]]]= ContextVar('server_timing_phases', default=None)
+
+
+@contextmanager
+def phase(name:str):
+    """
+    Times a block as one phase of the current request.
+    Outside a request handled by ServerTimingMiddleware it only costs the ContextVar lookup.
+    """
+    phases= _phases.get()
+    if phases is None:
+        yield
+        return
+    started= time.perf_counter()
+    try:
+        yield
+    finally:
+        phases.append((name, time.perf_counter()- started))
+
+
+class ServerTimingMiddleware:
+    """
+    Times every request and the phases views mark with `phase()`.
+
+    Durations feed the http_request_duration_seconds and http_request_phase_seconds
+    histograms, labelled by route. With SERVER_TIMING_HEADER=true they are also echoed in a
+    `Server-Timing` header so a single slow response shows where its time went. The header
+    is off by default: phase timings leak state to any caller (a login that skips the hash
+    phase reveals the account does not exist), so only enable it behind trusted access.
+    """
+    sync_capable= True
+    async_capable= True
+
+    def __init__(self, get_response):
+        self.get_response= get_response
+        self.registry= get_metrics_registry()
+        self.emit_header= os.getenv('SERVER_TIMING_HEADER', 'false').lower()=='true'
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        phases= []
+        token= _phases.set(phases)
+        started= time.perf_counter()
+        try:
+            response= self.get_response(request)
+        finally:
+            _phases.reset(token)
+        return self.finish(request, response, phases, time.perf_counter()- started)
+
+    async def __acall__(self, request):
+        phases= []
+        token= _phases.set(phases)
+        started= time.perf_counter()
+        try:
+            response= await self.get_response(request)
+        finally:
+            _phases.reset(token)
+        return self.finish(request, response, phases, time.perf_counter()- started)
+
+    def finish(self, request, response, phases:List[Tuple[str, float]], total:float):
+        """Records the request's durations and adds the Server-Timing header."""
+        match= getattr(request, 'resolver_match', None)
+        route= (match.url_name or match.route) if match else 'unmatched'
+        self.registry.observe(
+            'http_request_duration_seconds', total,
+            route=route, method=request.method, status=response.status_code,
+        )
+        for name, duration in phases:
+            self.registry.observe('http_request_phase_seconds', duration, route=route, phase=name)
+        if self.emit_header:
+            timings= [f'{name};dur={duration*1000:.3f}' for name, duration in phases]
+            timings.append(f'total;dur={total*1000:.3f}')
+            response['Server-Timing']= ', '.join(timings)
+        return response
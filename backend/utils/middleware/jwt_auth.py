@@ -0,0 +1,93 @@
+import logging
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+
+from utils.tokens.generate_token import async_verify_token, verify_token
+
+logger= logging.getLogger('django')
+
+
+def get_bearer_token(request):
+    """Extracts the token from an `Authorization: Bearer <token>` header, if any."""
+    scheme, _, token= request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower()!='bearer' or not token.strip():
+        return None
+    return token.strip()
+
+def is_operator(claims)-> bool:
+    """Whether verified claims belong to an AUTH_OPERATORS account."""
+    return bool(claims) and str(claims.get('sub', '')).lower() in getattr(settings, 'AUTH_OPERATORS', ())
+
+def unauthorized_response()-> JsonResponse:
+    """Builds the 401 returned for missing, invalid, expired or revoked tokens."""
+    response= JsonResponse({
+        'error':'Invalid or expired token!'
+    }, status=401)
+    response['WWW-Authenticate']= 'Bearer'
+    return response
+
+
+class JWTAuthenticationMiddleware:
+    """
+    Verifies the bearer token once per request and attaches its claims as `request.claims`.
+
+    Paths equal to an AUTH_PUBLIC_PATHS entry, or starting with an AUTH_PUBLIC_PREFIXES
+    prefix, pass through after a set lookup and a str.startswith check, without reading
+    any header. Every other request without a valid
+    token is answered with 401 before reaching a view. Verification goes through
+    verify_token, so repeat requests with the same token hit the claims cache.
+    Works under both WSGI and ASGI; under ASGI a revocation lookup is awaited on the async engine.
+    """
+    sync_capable= True
+    async_capable= True
+
+    def __init__(self, get_response):
+        self.get_response= get_response
+        self.public_paths= frozenset(getattr(settings, 'AUTH_PUBLIC_PATHS', ()))
+        self.public_prefixes= tuple(getattr(settings, 'AUTH_PUBLIC_PREFIXES', ()))
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def authenticate(self, request):
+        """Returns None when the request may proceed, or the 401 response to send."""
+        token= self.request_token(request)
+        if token is False:
+            return None
+        try:
+            request.claims= verify_token(token) if token else None
+        except Exception as exc:
+            logger.warning(f'Token verification failed for {request.path}: {str(exc)}')
+        return self.authenticated(request, token)
+
+    async def async_authenticate(self, request):
+        """Awaitable authenticate."""
+        token= self.request_token(request)
+        if token is False:
+            return None
+        try:
+            request.claims= await async_verify_token(token) if token else None
+        except Exception as exc:
+            logger.warning(f'Token verification failed for {request.path}: {str(exc)}')
+        return self.authenticated(request, token)
+
+    def request_token(self, request):
+        """Bearer token of request (None when missing), or False on a public path."""
+        request.claims= None
+        if request.path in self.public_paths or request.path.startswith(self.public_prefixes):
+            return False
+        return get_bearer_token(request)
+
+    def authenticated(self, request, token):
+        if not request.claims:
+            return unauthorized_response()
+        request.token= token
+        return None
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.authenticate(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return await self.async_authenticate(request) or await self.get_response(request)
@@ -0,0 +1,102 @@
+import logging
+import math
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict
+
+from utils.throttling.token_bucket import CacheBucketBackend, MemoryBucketBackend, ThrottledError
+
+logger= logging.getLogger('django')
+
+
+def client_ip(request)-> str:
+    """
+    Client address used as a throttling key.
+    X-Forwarded-For is only honoured when THROTTLE_TRUST_FORWARDED is set, since any
+    client can send it; behind a proxy, its first entry is the original client.
+    """
+    if os.getenv('THROTTLE_TRUST_FORWARDED', 'false').lower()=='true':
+        forwarded= request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class LoginThrottle:
+    """
+    Login rate limits, checked before any database or hashing work.
+
+    Two token buckets guard every attempt: one per client IP, against a single source
+    trying many accounts, and one per normalized email, against many sources trying
+    one account. A successful login refills the email bucket.
+    """
+    def __init__(
+            self,
+            backend,
+            ip_burst:int,
+            ip_per_minute:float,
+            email_burst:int,
+            email_per_minute:float,
+    ):
+        self.backend= backend
+        self.limits= {
+            'ip':(ip_burst, ip_per_minute/60),
+            'email':(email_burst, email_per_minute/60),
+        }
+        self._lock= threading.Lock()
+        self._counts= {'allowed':0, 'throttled_ip':0, 'throttled_email':0}
+
+    def _take(self, scope:str, value:str)-> None:
+        capacity, rate= self.limits[scope]
+        retry_after= self.backend.take(f'login:{scope}:{value}', capacity, rate)
+        if retry_after:
+            with self._lock:
+                self._counts[f'throttled_{scope}']+= 1
+            logger.warning(f'Login throttled by {scope}: {value}')
+            raise ThrottledError(math.ceil(retry_after), scope)
+
+    def check(self, ip:str, email:str)-> None:
+        """
+        Charges one login attempt to ip and email.
+        :raises: ThrottledError if either bucket is empty.
+        """
+        self._take('ip', ip)
+        self._take('email', email)
+        with self._lock:
+            self._counts['allowed']+= 1
+
+    def reset(self, email:str)-> None:
+        """Clears the email lockout after a successful login."""
+        self.backend.reset(f'login:email:{email}')
+
+    def stats(self)-> Dict[str, Any]:
+        """Attempt counters and currently locked-out keys, for monitoring."""
+        with self._lock:
+            stats= dict(self._counts)
+        stats['locked_ips']= self.backend.locked_keys('login:ip:')
+        stats['locked_emails']= self.backend.locked_keys('login:email:')
+        return stats
+
+
+@lru_cache()
+def get_login_throttle()-> LoginThrottle:
+    """
+    Process-wide login throttle.
+    LOGIN_THROTTLE_BACKEND=memory keeps buckets per process; LOGIN_THROTTLE_BACKEND=cache
+    shares them through the Django cache named by LOGIN_THROTTLE_CACHE.
+    """
+    if os.getenv('LOGIN_THROTTLE_BACKEND', 'memory')=='cache':
+        backend= CacheBucketBackend(os.getenv('LOGIN_THROTTLE_CACHE', 'default'))
+    else:
+        backend= MemoryBucketBackend(
+            shards=int(os.getenv('LOGIN_THROTTLE_SHARDS', 16)),
+            max_keys=int(os.getenv('LOGIN_THROTTLE_MAX_KEYS', 100_000)),
+        )
+    return LoginThrottle(
+        backend,
+        ip_burst=int(os.getenv('LOGIN_THROTTLE_IP_BURST', 20)),
+        ip_per_minute=float(os.getenv('LOGIN_THROTTLE_IP_PER_MINUTE', 10)),
+        email_burst=int(os.getenv('LOGIN_THROTTLE_EMAIL_BURST', 5)),
+        email_per_minute=float(os.getenv('LOGIN_THROTTLE_EMAIL_PER_MINUTE', 1)),
+    )
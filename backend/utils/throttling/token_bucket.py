@@ -0,0 +1,96 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class ThrottledError(RuntimeError):
+    """Raised when a request exceeds its rate limit."""
+    def __init__(self, retry_after:int, scope:str):
+        super().__init__(f'Too many requests for {scope}.')
+        self.retry_after= retry_after
+        self.scope= scope
+
+
+class MemoryBucketBackend:
+    """
+    Token buckets held in process memory.
+
+    Keys are spread over independently locked shards, so concurrent requests for different
+    clients rarely contend on the same lock. Each shard is an LRU capped at
+    max_keys/shards buckets; evicting a bucket only forgets its history.
+    Limits are per process: use CacheBucketBackend to share them across workers.
+    """
+    def __init__(self, shards:int=16, max_keys:int=100_000):
+        self._shards= [(threading.Lock(), OrderedDict()) for _ in range(max(1, shards))]
+        self._max_shard_keys= max(1, max_keys//len(self._shards))
+
+    def _shard(self, key:str):
+        return self._shards[hash(key)%len(self._shards)]
+
+    def take(self, key:str, capacity:float, rate:float)-> float:
+        """
+        Takes one token from key's bucket.
+        :param capacity: Bucket size, i.e. the allowed burst.
+        :param rate: Tokens refilled per second.
+        :returns: 0 if a token was taken, else seconds until one is available.
+        """
+        now= time.monotonic()
+        lock, buckets= self._shard(key)
+        with lock:
+            tokens, updated= buckets.get(key, (capacity, now))
+            tokens= min(capacity, tokens+ (now- updated)*rate)
+            retry_after= 0.0 if tokens>= 1 else (1- tokens)/rate
+            buckets[key]= (tokens- 1 if tokens>= 1 else tokens, now)
+            buckets.move_to_end(key)
+            if len(buckets)> self._max_shard_keys:
+                buckets.popitem(last=False)
+        return retry_after
+
+    def reset(self, key:str)-> None:
+        """Refills key's bucket."""
+        lock, buckets= self._shard(key)
+        with lock:
+            buckets.pop(key, None)
+
+    def locked_keys(self, prefix:str='')-> Optional[int]:
+        """Number of buckets under prefix that are currently empty."""
+        count= 0
+        for lock, buckets in self._shards:
+            with lock:
+                count+= sum(1 for key, (tokens, _) in buckets.items() if tokens< 1 and key.startswith(prefix))
+        return count
+
+
+class CacheBucketBackend:
+    """
+    Token buckets stored in a Django cache, shared by every worker using that cache.
+
+    Django's cache API has no compare-and-set, so concurrent takes on one key may both
+    succeed; the limit is approximate under races but holds across processes.
+    Refuses a per-process cache, which would share nothing.
+    """
+    def __init__(self, alias:str='default'):
+        from utils.cache.shared_cache import get_shared_cache
+
+        self.alias= alias
+        self.cache= get_shared_cache(alias, 'LOGIN_THROTTLE_CACHE')
+
+    def take(self, key:str, capacity:float, rate:float)-> float:
+        """Same contract as MemoryBucketBackend.take."""
+        now= time.time()
+        tokens, updated= self.cache.get(key) or (capacity, now)
+        tokens= min(capacity, tokens+ max(0.0, now- updated)*rate)
+        retry_after= 0.0 if tokens>= 1 else (1- tokens)/rate
+        # Expire once the bucket would be full again, since a full bucket needs no state.
+        self.cache.set(key, (tokens- 1 if tokens>= 1 else tokens, now), timeout=math.ceil(capacity/rate)+ 1)
+        return retry_after
+
+    def reset(self, key:str)-> None:
+        """Refills key's bucket."""
+        self.cache.delete(key)
+
+    def locked_keys(self, prefix:str='')-> Optional[int]:
+        """Not countable through the cache API."""
+        return None
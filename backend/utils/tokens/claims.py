@@ -0,0 +1,73 @@
+from dataclasses import dataclass, fields
+from json import dumps
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Dict, Type, TypeVar, get_type_hints
+
+T= TypeVar('T')
+
+# Field types with a specialised JSON encoder; anything else goes through json.dumps.
+_ENCODERS:Dict[type, str]= {
+    str:'_encode_str',
+    int:'_encode_int',
+}
+_NAMESPACE:Dict[str, Callable[[Any], str]]= {
+    '_encode_str':encode_basestring_ascii,
+    '_encode_int':int.__repr__,
+    '_encode_any':lambda value: dumps(value, separators=(',', ':')),
+}
+
+
+def claims_schema(cls:Type[T])-> Type[T]:
+    """
+    Turns an annotated class into a slotted, frozen claims type.
+
+    The validator (`validate`), mapping converter (`dict`) and compact JSON serializer
+    (`to_json`) are generated as straight-line code once, when the class is defined, so
+    issuing a token never walks annotations or calls setattr.
+    """
+    cls= dataclass(frozen=True, slots=True)(cls)
+    hints= get_type_hints(cls)
+    names= [field.name for field in fields(cls)]
+    namespace= {**_NAMESPACE, 'cls':cls, **{f'_type_{name}':hints[name] for name in names}}
+
+    checks= '\n'.join(
+        f'    if not isinstance({name}, _type_{name}):\n'
+        f'        raise TypeError(f"Invalid type for {name}: expected {hints[name].__name__}, got {{type({name}).__name__}}")'
+        for name in names
+    )
+    validate_src= (
+        'def validate(cls, data):\n'
+        '    try:\n'
+        + ''.join(f'        {name}= data["{name}"]\n' for name in names)
+        + '    except KeyError as missing:\n'
+        '        raise ValueError(f"Missing required field: {missing.args[0]}") from None\n'
+        f'{checks}\n'
+        f'    return cls({", ".join(names)})\n'
+    )
+    dict_src= (
+        'def dict(self):\n'
+        f'    return {{{", ".join(f"{name!r}: self.{name}" for name in names)}}}\n'
+    )
+    json_parts= ' + ","\n        + '.join(
+        f"'\"{name}\":' + {_ENCODERS.get(hints[name], '_encode_any')}(self.{name})"
+        for name in names
+    )
+    json_src= (
+        'def to_json(self):\n'
+        f'    return ("{{"\n        + {json_parts}\n        + "}}")\n'
+    )
+
+    exec(validate_src+ dict_src+ json_src, namespace)
+    cls.validate= classmethod(namespace['validate'])
+    cls.dict= namespace['dict']
+    cls.to_json= namespace['to_json']
+    return cls
+
+
+@claims_schema
+class PayloadInterface:
+    """Interface for payload structure."""
+    sub: str  # Subject (e.g, user_id)
+    exp: int  # Expiration time (seconds since epoch)
+    iat: int  # Issued at time (seconds since epoch)
+    jti: str  # Unique token id, used for revocation
@@ -1,76 +1,65 @@
+import base64
+import hashlib
+import hmac
+import json
 import logging
+import secrets
+import time
 import uuid
 import jwt
 import datetime
 import os
 
-from dataclasses import dataclass
-from typing import Dict, Any, Type
+from typing import Dict, Any, Optional
 from django.conf import settings
-from django.template.loader import render_to_string
 from dotenv import load_dotenv
-from functools import lru_cache
-from datetime import datetime, timedelta
+from functools import cached_property, lru_cache
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, select, update
 
 from config.settings.session_manager import get_db_session
-from modules.auth.auth_models import ClientUser
+from modules.auth.auth_models import ClientUser, EmailVerificationToken
+from utils.cache.ttl_cache import TTLCache
+from utils.mail.outbox import queue_email
+from utils.tokens.claims import PayloadInterface
+from utils.tokens.revocation import get_revocation_list
+from utils.tokens.signing_keys import load_keyring
 
 
 logger= logging.getLogger('django')
 
 load_dotenv()
 
-@dataclass(frozen=True)
-class PayloadModel:
-    """Custom interface for payload structure."""
-    def __init__(self, **kwargs):
-        """Initialize and validate fields."""
-        cls= self.__class__
-        hints= cls.__annotations__
+TOKEN_LIFETIME= timedelta(minutes=15)
+VERIFICATION_TOKEN_LIFETIME= timedelta(hours=3)
 
-        for field, field_type in hints.items():
-            if field not in kwargs:
-                raise ValueError(f'Missing required field: {field}')
 
-            value= kwargs[field]
-            if not isinstance(value, field_type):
-                raise TypeError(f'Invalid type for {field}: expected {field_type.__name__}, got {type(value.__name__)}')
-
-            setattr(self, field, value)
-
-    def dict(self)->Dict[str, Any]:
-        """Convert object to dictionary."""
-        return {
-            field: getattr(self, field) for field in self.__annotations__
-        }
-
-    @classmethod
-    def validate(cls:Type['PayloadModel'], data:Dict[str, Any])-> 'PayloadModel':
-        """Factory method to create an instance with validation."""
-        return cls(**data)
-
-@dataclass(frozen=True)
-class PayloadInterface(PayloadModel):
-    """Interface for payload structure."""
-    sub: str  # Subject (e.g, user_id)
-    exp: datetime  # Expiration time
-    iat: datetime  # Issued at time
+def b64url_encode(data:bytes)-> bytes:
+    """Unpadded URL-safe base64, as used by JWS compact serialization."""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
 
 
 class TokenConfig:
-    """Immutable configuration for JWT token generation."""
+    """
+    Immutable configuration for JWT token generation.
+    Signs with the active asymmetric key from JWT_KEYS_DIR when configured, HS256 with the Django secret otherwise.
+    """
     def __init__(self):
         self._algorithm:str= 'HS256'
         self._secret_key:str= os.getenv('DJANGO_SECRET_KEY')
+        self._keyring= load_keyring()
+        if self._keyring:
+            self._algorithm= self._keyring.active.algorithm
 
 
     def _validate_environ(self)->None:
         """Validates required environment variables if existing."""
         required=[
-            self._secret_key,
+            'DJANGO_SECRET_KEY',
         ]
-        if [var for var in required if not os.getenv(var)]:
-            raise ValueError
+        missing_var= [var for var in required if not os.getenv(var)]
+        if missing_var:
+            raise ValueError(f'Missing required environment variable: {', '.join(missing_var)}')
 
     @property
     def secret_key(self)->str:
@@ -81,16 +70,53 @@ class TokenConfig:
         except Exception as exc:
             raise exc
 
+    @cached_property
+    def _header_segment(self)-> bytes:
+        """Encoded JOSE header, identical to the one PyJWT emits for the same algorithm and kid."""
+        header= {'alg':self._algorithm, 'typ':'JWT'}
+        if self._keyring:
+            header['kid']= self._keyring.active.kid
+        return b64url_encode(json.dumps(header, separators=(',', ':'), sort_keys=True).encode())
+
+    @cached_property
+    def _mac(self)-> hmac.HMAC:
+        """HMAC keyed once with the secret; copied per token instead of re-keyed."""
+        return hmac.new(self._secret_key.encode(), digestmod=hashlib.sha256)
+
+    @property
+    def jwks_json(self)-> bytes:
+        """Serialized JWKS document with every public verification key."""
+        return self._keyring.jwks_json if self._keyring else b'{"keys":[]}'
+
+    def _sign(self, signing_input:bytes)-> bytes:
+        """Signs with the active key, or the pre-keyed HMAC in HS256 mode."""
+        if self._keyring:
+            return self._keyring.active.sign(signing_input)
+        mac= self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
     def tokenize(self,payload:PayloadInterface):
-        """Standardized tokenizer for encoding payloads."""
+        """
+        Standardized tokenizer for encoding payloads.
+        Builds the compact token directly from the precompiled claims serializer,
+        skipping PyJWT's generic header and claim handling.
+        """
         try:
-            return jwt.encode(payload.dict(), self._secret_key, self._algorithm)
+            signing_input= self._header_segment+ b'.'+ b64url_encode(payload.to_json().encode())
+            return (signing_input+ b'.'+ b64url_encode(self._sign(signing_input))).decode()
         except Exception as exc:
             raise exc
 
     def de_tokenize(self, token:str):
         """Standardized JWT token decoder that verifies if token is valid."""
         try:
+            if self._keyring:
+                # Only the algorithm bound to the token's kid is accepted, preventing algorithm confusion.
+                key= self._keyring.get(jwt.get_unverified_header(token).get('kid'))
+                if key is None:
+                    return None
+                return jwt.decode(token, key.public_key, [key.algorithm])
             return jwt.decode(
                 token,
                 self._secret_key,
@@ -114,10 +140,12 @@ service= get_token_config()
 
 def generate_token(payload_user):
     """Generates a JWT token for authenticated user."""
+    now= int(time.time())
     payload:dict={
         'sub':payload_user,
-        'exp':datetime.now()+ timedelta(minutes=15),
-        'iat':datetime.now()
+        'exp':now+ int(TOKEN_LIFETIME.total_seconds()),
+        'iat':now,
+        'jti':uuid.uuid4().hex,
     }
     try:
         _valid_payload= PayloadInterface.validate(payload)
@@ -125,57 +153,170 @@ def generate_token(payload_user):
     except Exception as exc:
         raise exc
 
+@lru_cache(maxsize=1)
+def get_claims_cache()-> TTLCache:
+    """Returns the in-process cache of verified token claims."""
+    return TTLCache(maxsize=int(os.getenv('TOKEN_CACHE_SIZE', 10000)))
+
+def token_digest(token:str)-> bytes:
+    """Fixed-size cache key for a token, so raw tokens are never held in memory."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def verified_claims(token:str)-> Optional[Dict[str, Any]]:
+    """Signature- and expiry-checked claims of token, from the claims cache when possible; not checked for revocation."""
+    key= token_digest(token)
+    cache= get_claims_cache()
+    claims= cache.get(key)
+    if claims is None:
+        try:
+            claims= service.de_tokenize(token)
+        except Exception as exc:
+            raise exc
+        if claims and 'exp' in claims:
+            cache.set(key, claims, expires_at=claims['exp'])
+    return claims
+
 def verify_token(token:str)->str:
-    """Verifies the JWT token and returns user data."""
-    try:
-        return service.de_tokenize(token)
-    except Exception as exc:
-        raise exc
+    """
+    Verifies the JWT token and returns user data.
+    Verified claims are cached until the token's own `exp`; invalid tokens are never cached.
+    """
+    claims= verified_claims(token)
+    if not claims or 'exp' not in claims:
+        return claims
+    if get_revocation_list().is_revoked(claims):
+        return None
+    return dict(claims)
+
+async def async_verify_token(token:str)-> Optional[Dict[str, Any]]:
+    """Awaitable verify_token, for ASGI: a revocation lookup never blocks the event loop."""
+    claims= verified_claims(token)
+    if not claims or 'exp' not in claims:
+        return claims
+    if await get_revocation_list().async_is_revoked(claims):
+        return None
+    return dict(claims)
+
+def revoke_token(token:str)-> bool:
+    """
+    Revokes a single token before its expiry (logout).
+    :returns: False if the token was already invalid, expired or revoked.
+    """
+    claims= verify_token(token)
+    if not claims or 'jti' not in claims:
+        return False
+    get_revocation_list().revoke(claims)
+    get_claims_cache().pop(token_digest(token))
+    return True
+
+def revoke_all_tokens(sub:str)-> None:
+    """Revokes every token issued to sub so far (kill all sessions)."""
+    get_revocation_list().revoke_subject(sub)
+
+def token_cache_stats()-> Dict[str, Any]:
+    """Hit/miss counters of the verified-claims cache."""
+    return get_claims_cache().stats()
 
 
 #==============================================
 # MAIL TOKEN GENERATION UTILITIES
 #==============================================
 
-def generate_verification_token(email):
-    """Generates a verification token for email confirmation."""
-    verif_code= str(uuid.uuid4())
-    exp= datetime.now() + timedelta(hours=3)
+def hash_verification_code(verif_code:str)-> str:
+    """Digest stored in place of a verification code."""
+    return hashlib.sha256(verif_code.encode()).hexdigest()
 
-    # Store verification code in database (maybe a separate table)
-    with get_db_session() as session:
-        user= session.query(ClientUser).filter_by(email=email).first()
-        if user:
-            user.verif_code= verif_code
-            user.exp= exp
-            session.commit()
+def verification_token_values(verif_code:str)-> Dict[str, Any]:
+    """Column values of the verification token row stored for verif_code."""
+    return {
+        'code_hash':hash_verification_code(verif_code),
+        'expires_at':datetime.now(timezone.utc)+ VERIFICATION_TOKEN_LIFETIME,
+    }
 
-    return verif_code
+def generate_verification_token(user_id:int, session=None)-> str:
+    """
+    Generates a verification token for email confirmation and stores its digest.
+    :param user_id: Id of the user to verify.
+    :param session: Optional open session to write in, so the token commits with the caller's transaction.
+    :returns: Plain verification code to embed in the link.
+    """
+    verif_code= secrets.token_urlsafe(32)
+    token= EmailVerificationToken(user_id=user_id, **verification_token_values(verif_code))
+    if session is not None:
+        session.add(token)
+    else:
+        with get_db_session() as session:
+            session.add(token)
 
+    return verif_code
 
-def send_verification_email(email:str, verif_code:str):
-    """Sends verification email to user."""
-    verif_url= f'{settings.SITE_URL}/auth/verify/{verif_code}'
-    context={
-        'verification_url':verif_url,
-        'exp':12,
+def consume_verification_token(verif_code:str)-> Optional[int]:
+    """
+    Marks the owner of a valid verification code as verified, consuming the code.
+    :returns: Verified user id, or None if the code is unknown or expired.
+    """
+    now= datetime.now(timezone.utc)
+    with get_db_session() as session:
+        user_id= session.execute(
+            delete(EmailVerificationToken)
+            .where(
+                EmailVerificationToken.code_hash==hash_verification_code(verif_code),
+                EmailVerificationToken.expires_at> now,
+            )
+            .returning(EmailVerificationToken.user_id)
+        ).scalar()
+        if user_id is None:
+            return None
+        session.execute(
+            update(ClientUser)
+            .where(ClientUser.id==user_id, ClientUser.email_verified_at.is_(None))
+            .values(email_verified_at=now)
+        )
+    return user_id
+
+def purge_expired_verification_tokens(chunk_size:int=1000, pause:float=0.0)-> int:
+    """
+    Deletes expired verification tokens in chunks, committing after each one so the sweep
+    never holds long locks or builds a large transaction.
+    :param chunk_size: Rows deleted per statement.
+    :param pause: Seconds to sleep between chunks to spread load.
+    :returns: Total number of rows deleted.
+    """
+    total= 0
+    while True:
+        expired= (
+            select(EmailVerificationToken.id)
+            .where(EmailVerificationToken.expires_at<= datetime.now(timezone.utc))
+            .limit(chunk_size)
+            .scalar_subquery()
+        )
+        with get_db_session() as session:
+            deleted= session.execute(
+                delete(EmailVerificationToken).where(EmailVerificationToken.id.in_(expired))
+            ).rowcount
+        total+= deleted
+        if deleted< chunk_size:
+            return total
+        if pause:
+            time.sleep(pause)
+
+
+def verification_email_values(email:str, verif_code:str)-> Dict[str, Any]:
+    """Outbox fields of the verification email for verif_code."""
+    verif_url= f'{settings.SITE_URL}/auth/verify/{verif_code}/'
+    return {
+        'recipient':email,
+        'subject':'Verify Your Email Address',
+        'template':'email/verify_email',
+        'context':{
+            'verification_url':verif_url,
+            'exp':int(VERIFICATION_TOKEN_LIFETIME.total_seconds()//3600),
+        },
     }
 
-    email_html= render_to_string('email/verify_email.html', context)
-    email_text= render_to_string('email/verify_email.txt', context)
-
-    try:
-        from django.core.mail import send_mail
-        send_mail(
-            subject='Verify Your Email Address',
-            message=email_text,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            html_message=email_html,
-            fail_silently=False,
-        )
-        logger.info(f'Verification email sent to {email}')
-        return True
-    except Exception as exc:
-        logger.error(f'Failed to send verification email to {email}: {str(exc)}')
-        return False
\ No newline at end of file
+def queue_verification_email(email:str, verif_code:str, session=None):
+    """
+    Queues the verification email in the outbox; the send_outbox worker delivers it.
+    :param session: Open session to write in, so the email commits with the registration.
+    """
+    return queue_email(**verification_email_values(email, verif_code), session=session)
@@ -0,0 +1,231 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from sqlalchemy import and_, delete, exists, or_, select
+from sqlalchemy.dialects.postgresql import insert
+
+from config.settings.database import get_sessionmaker
+from config.settings.session_manager import get_async_db_session, get_db_session
+from modules.auth.auth_models import RevokedToken
+from utils.cache.bloom_filter import ExpiringBloomFilter
+
+logger= logging.getLogger('django')
+
+
+def as_datetime(timestamp:float)-> datetime:
+    """UTC datetime for a JWT NumericDate."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+class TokenRevocationList:
+    """
+    Denylist of revoked tokens fronted by a per-process Bloom filter.
+
+    The filter answers "not revoked" without I/O for almost every token; only filter hits
+    are confirmed against the revoked_token table. A background thread pulls in other
+    processes' revocations every `sync_interval` seconds, so request handling never waits
+    on it; until its first pull completes, every check is confirmed against the table.
+    Expired rows are deleted by the purge_revoked_tokens command, not on the request path.
+    """
+    def __init__(
+            self,
+            capacity:int,
+            error_rate:float,
+            token_lifetime:int,
+            sync_interval:float,
+            sync_margin:float=60.0,
+    ):
+        self.token_lifetime= token_lifetime
+        self.sync_interval= sync_interval
+        self.sync_margin= sync_margin
+        self._filter= ExpiringBloomFilter(capacity, error_rate, bucket_seconds=max(60, token_lifetime//3))
+        self._synced_until:Optional[datetime]= None
+        self._ready= threading.Event()
+        self._lock= threading.Lock()
+        self._worker:Optional[threading.Thread]= None
+        self._checks= 0
+        self._filter_hits= 0
+        self._confirmed= 0
+
+    def is_revoked(self, claims:Dict[str, Any])-> bool:
+        """
+        Checks verified claims against the denylist.
+
+        :param claims: Claims of a token whose signature and expiry were already verified.
+        :returns: True if the token, or every token of its subject, has been revoked.
+        """
+        statement= self._lookup(claims)
+        if statement is None:
+            return False
+        with get_db_session() as session:
+            revoked= session.scalar(statement)
+        return self._confirm(revoked)
+
+    async def async_is_revoked(self, claims:Dict[str, Any])-> bool:
+        """Awaitable is_revoked: a filter hit is confirmed without blocking the event loop."""
+        statement= self._lookup(claims)
+        if statement is None:
+            return False
+        async with get_async_db_session() as session:
+            revoked= await session.scalar(statement)
+        return self._confirm(revoked)
+
+    def _lookup(self, claims:Dict[str, Any]):
+        """Query confirming a filter hit, or None when the filter rules the token out."""
+        self._start_worker()
+        self._checks+= 1
+        exp= claims['exp']
+        jti= claims.get('jti')
+        sub= claims.get('sub')
+        ready= self._ready.is_set()
+        jti_hit= jti is not None and (not ready or self._filter.might_contain(f'jti:{jti}', exp))
+        sub_hit= sub is not None and (not ready or self._filter.might_contain(f'sub:{sub}', exp))
+        if not (jti_hit or sub_hit):
+            return None
+
+        self._filter_hits+= 1
+        conditions= []
+        if jti_hit:
+            conditions.append(RevokedToken.jti==jti)
+        if sub_hit:
+            # revoked_at is stored truncated to the second, like iat: a token issued in the
+            # second of a logout-all (a re-login) stays valid, every earlier one is revoked.
+            conditions.append(and_(
+                RevokedToken.jti.is_(None),
+                RevokedToken.sub==sub,
+                RevokedToken.revoked_at> as_datetime(claims.get('iat', 0)),
+            ))
+        return select(exists().where(or_(*conditions)))
+
+    def _confirm(self, revoked:Optional[bool])-> bool:
+        if revoked:
+            self._confirmed+= 1
+        return bool(revoked)
+
+    def revoke(self, claims:Dict[str, Any])-> None:
+        """Revokes the single token the claims belong to. Revoking it twice (concurrent logouts) is a no-op."""
+        with get_db_session() as session:
+            session.execute(
+                insert(RevokedToken)
+                .values(
+                    jti=claims['jti'],
+                    sub=claims['sub'],
+                    revoked_at=datetime.now(timezone.utc),
+                    expires_at=as_datetime(claims['exp']),
+                )
+                .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+            )
+        self._filter.add(f"jti:{claims['jti']}", claims['exp'])
+
+    def revoke_subject(self, sub:str)-> None:
+        """Revokes every token issued to sub before the current second."""
+        now= int(time.time())
+        with get_db_session() as session:
+            session.add(RevokedToken(
+                jti=None,
+                sub=sub,
+                revoked_at=as_datetime(now),
+                expires_at=as_datetime(now+ self.token_lifetime),
+            ))
+        self._filter.add(f'sub:{sub}', now+ self.token_lifetime, valid_from=now)
+
+    def sync(self)-> int:
+        """
+        Loads revocations recorded since the last sync into the filter.
+
+        Rows are selected by revoked_at over a trailing window of sync_margin seconds rather
+        than by id: serial ids can commit out of order, and a high-water mark on them would
+        skip a row committed after a higher id forever. Re-adding a row is harmless.
+        Runs on its own session, never a request's unit of work.
+
+        :returns: Number of rows loaded.
+        """
+        now= datetime.now(timezone.utc)
+        statement= (
+            select(RevokedToken.jti, RevokedToken.sub, RevokedToken.revoked_at, RevokedToken.expires_at)
+            .where(RevokedToken.expires_at> now)
+        )
+        if self._synced_until is not None:
+            statement= statement.where(
+                RevokedToken.revoked_at> self._synced_until- timedelta(seconds=self.sync_margin)
+            )
+        with get_sessionmaker()() as session:
+            rows= session.execute(statement).all()
+
+        for row in rows:
+            if row.jti is not None:
+                self._filter.add(f'jti:{row.jti}', row.expires_at.timestamp())
+            else:
+                self._filter.add(f'sub:{row.sub}', row.expires_at.timestamp(), valid_from=row.revoked_at.timestamp())
+        self._synced_until= now
+        self._ready.set()
+        return len(rows)
+
+    def _start_worker(self)-> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker= threading.Thread(target=self._run, name='revocation-sync', daemon=True)
+                self._worker.start()
+
+    def _run(self)-> None:
+        """Worker loop pulling revocations every sync_interval seconds."""
+        while True:
+            try:
+                self.sync()
+            except Exception as exc:
+                logger.error(f'Token revocation sync failed: {str(exc)}')
+            time.sleep(self.sync_interval)
+
+    def stats(self)-> Dict[str, Any]:
+        """Counters showing how often the Bloom filter avoided a database lookup."""
+        return {
+            'checks':self._checks,
+            'filter_hits':self._filter_hits,
+            'confirmed':self._confirmed,
+            'false_positives':self._filter_hits- self._confirmed,
+            'buckets':len(self._filter),
+        }
+
+
+@lru_cache(maxsize=1)
+def get_revocation_list()-> TokenRevocationList:
+    """Returns the process-wide token revocation list."""
+    from utils.tokens.generate_token import TOKEN_LIFETIME
+
+    return TokenRevocationList(
+        capacity=int(os.getenv('TOKEN_REVOCATION_CAPACITY', 100000)),
+        error_rate=float(os.getenv('TOKEN_REVOCATION_ERROR_RATE', 0.001)),
+        token_lifetime=int(TOKEN_LIFETIME.total_seconds()),
+        sync_interval=float(os.getenv('TOKEN_REVOCATION_SYNC_INTERVAL', 5)),
+        sync_margin=float(os.getenv('TOKEN_REVOCATION_SYNC_MARGIN', 60)),
+    )
+
+
+def purge_expired_revocations(chunk_size:int=1000, pause:float=0.0)-> int:
+    """
+    Deletes revoked_token rows whose tokens have expired, in chunks committed one at a time.
+    :param chunk_size: Rows deleted per statement.
+    :param pause: Seconds to sleep between chunks to spread load.
+    :returns: Total number of rows deleted.
+    """
+    total= 0
+    while True:
+        expired= (
+            select(RevokedToken.id)
+            .where(RevokedToken.expires_at<= datetime.now(timezone.utc))
+            .limit(chunk_size)
+            .scalar_subquery()
+        )
+        with get_db_session() as session:
+            deleted= session.execute(delete(RevokedToken).where(RevokedToken.id.in_(expired))).rowcount
+        total+= deleted
+        if deleted< chunk_size:
+            return total
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,121 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding, rsa
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    """One asymmetric key pair identified by its `kid`."""
+    kid: str
+    algorithm: str          # JWS algorithm name: EdDSA or RS256
+    private_key: Any
+    public_key: Any
+
+    def sign(self, signing_input:bytes)-> bytes:
+        """Signs a JWS signing input with this key's algorithm."""
+        if self.algorithm=='EdDSA':
+            return self.private_key.sign(signing_input)
+        return self.private_key.sign(signing_input, padding.PKCS1v15(), hashes.SHA256())
+
+    def jwk(self)-> Dict[str, Any]:
+        """Public JWK for this key, as published in the JWKS document."""
+        exporter= OKPAlgorithm if self.algorithm=='EdDSA' else RSAAlgorithm
+        jwk= exporter.to_jwk(self.public_key, as_dict=True)
+        jwk.update({'kid':self.kid, 'alg':self.algorithm, 'use':'sig'})
+        return jwk
+
+
+def algorithm_for(private_key:Any)-> str:
+    """JWS algorithm matching a private key type."""
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return 'EdDSA'
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return 'RS256'
+    raise ValueError(f'Unsupported signing key type: {type(private_key).__name__}')
+
+
+class KeyRing:
+    """
+    Signing keys loaded from `<kid>.pem` files in a directory.
+
+    Every key in the directory is accepted for verification and published in the JWKS,
+    while only the active one signs new tokens. To rotate: add a key, wait for consumers to
+    refresh their JWKS cache, activate it, then delete the old file once its last tokens expire.
+    A lone key is active by default; with several, active_kid must name one, so adding a key
+    never makes it sign before it has been published.
+    """
+    def __init__(self, keys:List[SigningKey], active_kid:Optional[str]=None):
+        if not keys:
+            raise ValueError('Key ring requires at least one signing key.')
+        self._keys= {key.kid: key for key in keys}
+        if active_kid is None and len(self._keys)> 1:
+            raise ValueError(
+                f'Key ring holds {len(self._keys)} signing keys: set JWT_ACTIVE_KID to the one that signs.'
+            )
+        kid= active_kid or next(iter(self._keys))
+        if kid not in self._keys:
+            raise ValueError(f'Active signing key "{kid}" not found in key ring.')
+        self.active= self._keys[kid]
+        self.jwks_json= json.dumps({'keys':[key.jwk() for key in self._keys.values()]}).encode()
+
+    def get(self, kid:Optional[str])-> Optional[SigningKey]:
+        """Returns the verification key for kid, or None if unknown."""
+        return self._keys.get(kid) if kid else None
+
+    @classmethod
+    def from_directory(
+            cls,
+            path:str,
+            active_kid:Optional[str]=None,
+            password:Optional[bytes]=None,
+    )-> 'KeyRing':
+        """Loads every PEM private key in path, using each file name as its kid."""
+        keys= []
+        for pem in sorted(Path(path).glob('*.pem')):
+            private_key= serialization.load_pem_private_key(pem.read_bytes(), password=password)
+            keys.append(SigningKey(
+                kid=pem.stem,
+                algorithm=algorithm_for(private_key),
+                private_key=private_key,
+                public_key=private_key.public_key(),
+            ))
+        return cls(keys, active_kid=active_kid)
+
+
+def generate_private_key(algorithm:str)-> Any:
+    """Creates a new private key for the given JWS algorithm."""
+    if algorithm=='EdDSA':
+        return ed25519.Ed25519PrivateKey.generate()
+    if algorithm=='RS256':
+        return rsa.generate_private_key(public_exponent=65537, key_size=3072)
+    raise ValueError(f'Unsupported signing algorithm: {algorithm}')
+
+def write_private_key(private_key:Any, path:Path, password:Optional[bytes]=None)-> None:
+    """Writes a private key as PKCS#8 PEM readable only by its owner."""
+    encryption= (serialization.BestAvailableEncryption(password) if password
+                 else serialization.NoEncryption())
+    pem= private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=encryption,
+    )
+    fd= os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as key_file:
+        key_file.write(pem)
+
+def load_keyring()-> Optional[KeyRing]:
+    """Builds the key ring from JWT_KEYS_DIR, or returns None to keep HS256 signing."""
+    keys_dir= os.getenv('JWT_KEYS_DIR')
+    if not keys_dir:
+        return None
+    password= os.getenv('JWT_KEYS_PASSWORD')
+    return KeyRing.from_directory(
+        keys_dir,
+        active_kid=os.getenv('JWT_ACTIVE_KID') or None,
+        password=password.encode() if password else None,
+    )